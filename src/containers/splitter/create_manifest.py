@@ -7,14 +7,21 @@ generates a manifest.json containing metadata about the segmentation
 and shot guidance recommendations.
 """
 
-import glob
 import json
 import logging
 import os
 import re
+import stat
 import sys
 from typing import Any, Dict, List, Optional
 
+# orjson is a C-implemented encoder that is substantially faster than the
+# stdlib for large manifests; fall back to stdlib json if unavailable.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging with structured format for CloudWatch
 logging.basicConfig(
     level=logging.INFO,
@@ -29,7 +36,10 @@ DEFAULT_OUTPUT_DIR: str = "/work/out"
 DEFAULT_CHUNK_SECONDS: float = 300.0
 SEGMENT_PATTERN: str = "seg_*.mp4"
 MANIFEST_FILENAME: str = "manifest.json"
-S3_URI_PATTERN: re.Pattern = re.compile(r'^s3://[a-z0-9][a-z0-9.-]*[a-z0-9](/.*)?$')
+# Pure-ASCII pattern; re.ASCII skips Unicode-property lookups while matching
+S3_URI_PATTERN: re.Pattern = re.compile(
+    r'^s3://[a-z0-9][a-z0-9.-]*[a-z0-9](/.*)?$', re.ASCII
+)
 
 
 def validate_s3_uri(uri: str, field_name: str) -> None:
@@ -66,10 +76,14 @@ def validate_output_dir(path: str) -> None:
     if not path:
         raise ValueError("Output directory path is required")
 
-    if not os.path.exists(path):
+    # One stat call covers both the existence and directory checks
+    # (os.path.exists/isdir would each stat the path again)
+    try:
+        st = os.stat(path)
+    except OSError:
         raise ValueError(f"Output directory does not exist: {path}")
 
-    if not os.path.isdir(path):
+    if not stat.S_ISDIR(st.st_mode):
         raise ValueError(f"Output path is not a directory: {path}")
 
     if not os.access(path, os.R_OK):
@@ -123,40 +137,71 @@ def create_manifest(
         validate_chunk_seconds(chunk_seconds)
     validate_s3_uri(s3_prefix, "s3_prefix")
 
-    # Find all segment files and sort them
-    segment_pattern = os.path.join(output_dir, SEGMENT_PATTERN)
-    segments = sorted(glob.glob(segment_pattern))
+    # Find all segment files and sort them. os.scandir batches directory
+    # reads and avoids the per-entry stat calls glob performs, which matters
+    # on network-backed output directories with many segments.
+    with os.scandir(output_dir) as entries:
+        segments = sorted(
+            entry.name
+            for entry in entries
+            if entry.name.startswith("seg_")
+            and entry.name.endswith(".mp4")
+            and entry.is_file(follow_symlinks=False)
+        )
 
     if not segments:
-        logger.warning(f"No segments found matching pattern: {segment_pattern}")
+        logger.warning(
+            f"No segments found matching pattern: "
+            f"{os.path.join(output_dir, SEGMENT_PATTERN)}"
+        )
 
     # Normalize S3 prefix (remove trailing slash)
     s3_prefix_normalized = s3_prefix.rstrip('/')
 
-    # Build manifest structure
+    # Build manifest structure (segments already hold bare filenames).
+    # Preallocating skips the repeated list growth for very large counts.
+    segment_entries: List[Dict[str, Any]] = [None] * len(segments)
+    for i, name in enumerate(segments):
+        segment_entries[i] = {
+            "index": i,
+            "filename": name,
+            "s3_uri": f"{s3_prefix_normalized}/raw/{name}"
+        }
+
     manifest: Dict[str, Any] = {
         "version": "1.0",
         "chunk_seconds": chunk_seconds,
         "segment_count": len(segments),
-        "segments": [
-            {
-                "index": i,
-                "filename": os.path.basename(path),
-                "s3_uri": f"{s3_prefix_normalized}/raw/{os.path.basename(path)}"
-            }
-            for i, path in enumerate(segments)
-        ]
+        "segments": segment_entries
     }
 
     # Add shot guidance metadata if available
     if shot_guidance:
         manifest["metadata"] = shot_guidance
 
-    # Write manifest to file
+    # Write manifest to file. Encode once and write in a single call rather
+    # than letting json.dump issue many small writes through a text wrapper;
+    # this keeps the write fast for manifests with thousands of segments.
+    # The manifest is consumed by downstream pipeline stages, so it is
+    # compact by default; set MANIFEST_PRETTY=1 for a readable dump.
     manifest_path = os.path.join(output_dir, output_file)
+    pretty = os.environ.get("MANIFEST_PRETTY", "").lower() in {"1", "true", "yes", "on"}
+    if orjson is not None:
+        payload = orjson.dumps(
+            manifest, option=orjson.OPT_INDENT_2 if pretty else 0
+        )
+    elif pretty:
+        payload = json.dumps(manifest, indent=2).encode("utf-8")
+    else:
+        payload = json.dumps(manifest, separators=(",", ":")).encode("utf-8")
+    # Write to a temp file and rename so concurrent readers (pipelined
+    # splitter -> uploader setups) never observe a truncated manifest;
+    # os.replace is atomic on POSIX.
+    tmp_path = f"{manifest_path}.tmp"
     try:
-        with open(manifest_path, "w", encoding="utf-8") as f:
-            json.dump(manifest, f, indent=2)
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, manifest_path)
     except IOError as e:
         logger.error(f"Failed to write manifest file: {manifest_path}")
         raise
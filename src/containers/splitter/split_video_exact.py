@@ -18,12 +18,18 @@ Optional (faster on NVIDIA GPUs if available in your environment):
 """
 
 import argparse
+import bisect
+import concurrent.futures
 import json
 import logging
 import math
 import os
+import re
 import subprocess
 import sys
+import tempfile
+import threading
+import time
 from pathlib import Path
 from typing import Optional
 
@@ -49,6 +55,32 @@ VIDEO_TRACK_TIMESCALE: int = 90000  # Standard MPEG timescale
 ASSUMED_FPS: int = 30  # Fallback FPS for GOP calculation
 FFMPEG_TIMEOUT_SECONDS: int = 7200  # 2 hour timeout for FFmpeg operations
 SEGMENT_PATTERN: str = "seg_%04d.mp4"
+# Fragmented MP4 writes a streamable file in one pass; +faststart would
+# rewrite every finished segment just to relocate the moov atom
+MOVFLAGS: str = "+frag_keyframe+empty_moov+default_base_moof"
+DEFAULT_NVENC_PRESET: str = "p4"  # NVENC preset used when an x264-style preset is given
+
+# Cached result of the ffmpeg NVENC capability probe (None = not probed yet)
+_NVENC_AVAILABLE: Optional[bool] = None
+
+
+def nvenc_available() -> bool:
+    """
+    Check (once) whether this ffmpeg build has the NVENC encoders.
+
+    Returns:
+        True if h264_nvenc appears in ffmpeg's encoder list
+    """
+    global _NVENC_AVAILABLE
+    if _NVENC_AVAILABLE is None:
+        try:
+            result = run_command(["ffmpeg", "-hide_banner", "-encoders"], timeout=10)
+            _NVENC_AVAILABLE = (
+                result.returncode == 0 and "h264_nvenc" in result.stdout
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            _NVENC_AVAILABLE = False
+    return _NVENC_AVAILABLE
 
 
 def run_command(
@@ -143,22 +175,24 @@ def validate_output_dir(path: str) -> Path:
     return outdir
 
 
-def ffprobe_duration(path: str) -> float:
+def ffprobe_info(path: str) -> tuple[float, float]:
     """
-    Get video duration using ffprobe.
+    Get video duration and frame rate using ffprobe.
 
     Args:
         path: Path to the video file
 
     Returns:
-        Duration in seconds
+        Tuple of (duration in seconds, frames per second); fps falls
+        back to ASSUMED_FPS when the stream does not report one
 
     Raises:
         RuntimeError: If ffprobe fails
     """
     cmd = [
         "ffprobe", "-v", "error",
-        "-show_entries", "format=duration",
+        "-select_streams", "v:0",
+        "-show_entries", "format=duration:stream=r_frame_rate",
         "-of", "json",
         path
     ]
@@ -175,11 +209,110 @@ def ffprobe_duration(path: str) -> float:
         duration = float(data["format"]["duration"])
         if duration <= 0:
             raise ValueError("Duration must be positive")
-        return duration
     except (json.JSONDecodeError, KeyError, ValueError) as e:
         logger.error(f"Failed to parse ffprobe output: {e}")
         raise RuntimeError(f"Failed to parse video duration: {e}")
 
+    # r_frame_rate is a rational like "60000/1001"; a bad or missing
+    # value just means the GOP computation uses the assumed rate
+    fps = float(ASSUMED_FPS)
+    try:
+        num, _, den = data["streams"][0]["r_frame_rate"].partition("/")
+        parsed = float(num) / float(den or 1)
+        if parsed > 0:
+            fps = parsed
+    except (KeyError, IndexError, ValueError, ZeroDivisionError):
+        logger.warning(f"Could not parse frame rate; assuming {ASSUMED_FPS} fps")
+
+    return duration, fps
+
+
+def _keyframe_cache_path(input_path: str) -> Path:
+    """Return the sidecar path caching the keyframe-alignment probe result."""
+    return Path(f"{input_path}.split_cache.json")
+
+
+def keyframes_aligned(
+    input_path: str,
+    chunk_seconds: float,
+    duration: float
+) -> bool:
+    """
+    Check whether the source already has a keyframe at every chunk boundary.
+
+    When it does, stream copy produces the same cuts as a full re-encode
+    at I/O speed, so the encoder can be skipped entirely. The probe scans
+    every packet, so the verdict is cached in a JSON sidecar beside the
+    input keyed on its mtime/size.
+
+    Args:
+        input_path: Path to input video
+        chunk_seconds: Duration of each segment
+        duration: Total video duration in seconds
+
+    Returns:
+        True if every boundary k*chunk_seconds falls within
+        SEGMENT_TIME_DELTA of a source keyframe
+    """
+    st = os.stat(input_path)
+    cache_path = _keyframe_cache_path(input_path)
+    try:
+        cached = json.loads(cache_path.read_text())
+        if (
+            cached.get("chunk_seconds") == chunk_seconds
+            and cached.get("mtime") == st.st_mtime
+            and cached.get("size") == st.st_size
+        ):
+            return bool(cached["aligned"])
+    except (OSError, json.JSONDecodeError, KeyError):
+        pass
+
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,flags",
+        "-of", "csv=p=0",
+        input_path
+    ]
+    result = run_command(cmd, timeout=600)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe packet scan failed:\n{result.stderr}")
+
+    keyframes = []
+    for line in result.stdout.splitlines():
+        pts, _, flags = line.partition(",")
+        if "K" in flags:
+            try:
+                keyframes.append(float(pts))
+            except ValueError:
+                continue
+    keyframes.sort()
+
+    def has_keyframe_near(boundary: float) -> bool:
+        i = bisect.bisect_left(keyframes, boundary)
+        for j in (i - 1, i):
+            if 0 <= j < len(keyframes) and abs(keyframes[j] - boundary) <= SEGMENT_TIME_DELTA:
+                return True
+        return False
+
+    aligned = all(
+        has_keyframe_near(k * chunk_seconds)
+        for k in range(1, int(math.ceil(duration / chunk_seconds)))
+    )
+
+    try:
+        cache_path.write_text(json.dumps({
+            "chunk_seconds": chunk_seconds,
+            "mtime": st.st_mtime,
+            "size": st.st_size,
+            "aligned": aligned
+        }))
+    except OSError:
+        # Cache is best-effort; a read-only input directory is fine
+        pass
+
+    return aligned
+
 
 def build_stream_copy_command(
     input_path: str,
@@ -220,7 +353,9 @@ def build_reencode_command(
     crf: int,
     preset: str,
     pix_fmt: str,
-    force_keyframes: bool
+    force_keyframes: bool,
+    hwaccel: bool = False,
+    fps: float = float(ASSUMED_FPS)
 ) -> list[str]:
     """
     Build FFmpeg command for re-encoding mode (precise segment boundaries).
@@ -236,12 +371,25 @@ def build_reencode_command(
         preset: Encoder preset
         pix_fmt: Pixel format
         force_keyframes: Whether to force keyframes at boundaries
+        hwaccel: Whether to decode on the GPU (NVENC codecs)
+        fps: Source frame rate, used to size the GOP
 
     Returns:
         FFmpeg command as list of strings
     """
-    cmd = [
-        "ffmpeg", "-hide_banner", "-y",
+    cmd = ["ffmpeg", "-hide_banner", "-y"]
+
+    # GPU decode for the NVENC path; the encode already happens on the GPU,
+    # so decoding there too avoids a CPU software decode feeding it. With
+    # -hwaccel_output_format cuda decoded frames stay in VRAM all the way
+    # to NVENC instead of round-tripping over PCIe once per frame.
+    gpu_frames = hwaccel and vcodec in ("h264_nvenc", "hevc_nvenc")
+    if hwaccel:
+        cmd += ["-hwaccel", "cuda"]
+        if gpu_frames:
+            cmd += ["-hwaccel_output_format", "cuda"]
+
+    cmd += [
         "-i", input_path,
         # Map only primary video and all audio streams (not thumbnails/alternate streams)
         "-map", "0:v:0",  # First video stream only
@@ -251,18 +399,36 @@ def build_reencode_command(
     # Add video filter to ensure dimensions are divisible by 2 (required by libx264/libx265)
     # This handles edge cases where the primary stream has odd dimensions
     # scale formula rounds down to nearest even number while maintaining aspect ratio
-    if vcodec in ("libx264", "libx265", "h264_nvenc", "hevc_nvenc"):
+    if gpu_frames:
+        # CUDA frames cannot pass through the software scaler; scale_cuda
+        # does the even-dimension fixup (and nv12 conversion) on the GPU
+        cmd += ["-vf", "scale_cuda=trunc(iw/2)*2:trunc(ih/2)*2:format=nv12"]
+    elif vcodec in ("libx264", "libx265", "h264_nvenc", "hevc_nvenc"):
         cmd += ["-vf", "scale=trunc(iw/2)*2:trunc(ih/2)*2"]
 
     cmd += ["-c:v", vcodec]
 
-    # CRF only applies to x264/x265-style encoders
+    # CRF only applies to x264/x265-style encoders; NVENC uses its own
+    # preset tokens (p1-p7) and constant-quality rate control, with -cq
+    # standing in for CRF
     if vcodec in ("libx264", "libx265"):
         cmd += ["-crf", str(crf), "-preset", preset]
+    elif vcodec in ("h264_nvenc", "hevc_nvenc"):
+        nvenc_preset = preset if re.fullmatch(r"p[1-7]", preset) else DEFAULT_NVENC_PRESET
+        cmd += [
+            "-preset", nvenc_preset,
+            "-tune", "hq",
+            "-rc", "vbr",
+            "-cq", str(crf),
+            "-b:v", "0"
+        ]
     else:
         cmd += ["-preset", preset]
 
-    cmd += ["-pix_fmt", pix_fmt]
+    # -pix_fmt would force the CUDA frames back to system memory; the
+    # scale_cuda filter above already pins the format on the GPU
+    if not gpu_frames:
+        cmd += ["-pix_fmt", pix_fmt]
     cmd += ["-c:a", acodec, "-b:a", abitrate]
 
     # Force keyframes at exact boundaries
@@ -270,8 +436,10 @@ def build_reencode_command(
         force_kf_expr = f"expr:gte(t,n_forced*{chunk_seconds})"
         cmd += ["-force_key_frames", force_kf_expr]
 
-    # Set GOP size to match segment duration
-    gop_size = int(chunk_seconds * ASSUMED_FPS)
+    # Set GOP size to match segment duration at the source's real frame
+    # rate; assuming 30 fps on a 60 fps source would double the keyframe
+    # count and inflate every segment
+    gop_size = int(chunk_seconds * fps)
     cmd += ["-g", str(gop_size)]
     cmd += ["-keyint_min", str(gop_size)]
 
@@ -282,7 +450,7 @@ def build_reencode_command(
         "-segment_time_delta", str(SEGMENT_TIME_DELTA),
         "-reset_timestamps", "1",
         "-avoid_negative_ts", "make_zero",
-        "-movflags", "+faststart",
+        "-movflags", MOVFLAGS,
         "-video_track_timescale", str(VIDEO_TRACK_TIMESCALE),
         str(output_dir / SEGMENT_PATTERN)
     ]
@@ -290,6 +458,157 @@ def build_reencode_command(
     return cmd
 
 
+def build_single_segment_command(
+    input_path: str,
+    output_path: Path,
+    start: float,
+    end: float,
+    vcodec: str,
+    acodec: str,
+    abitrate: str,
+    crf: int,
+    preset: str,
+    pix_fmt: str,
+    hwaccel: bool = False
+) -> list[str]:
+    """
+    Build FFmpeg command that re-encodes one time range into one segment.
+
+    Used by the parallel split path: each range starts with its own
+    keyframe, so no segment muxer or forced-keyframe expression is needed.
+
+    Args:
+        input_path: Path to input video
+        output_path: Output file for this segment
+        start: Range start in seconds
+        end: Range end in seconds
+        vcodec: Video codec to use
+        acodec: Audio codec to use
+        abitrate: Audio bitrate
+        crf: Constant rate factor for quality
+        preset: Encoder preset
+        pix_fmt: Pixel format
+        hwaccel: Whether to decode on the GPU (NVENC codecs)
+
+    Returns:
+        FFmpeg command as list of strings
+    """
+    cmd = ["ffmpeg", "-hide_banner", "-y"]
+    gpu_frames = hwaccel and vcodec in ("h264_nvenc", "hevc_nvenc")
+    if hwaccel:
+        cmd += ["-hwaccel", "cuda"]
+        if gpu_frames:
+            cmd += ["-hwaccel_output_format", "cuda"]
+
+    # -ss before -i for fast input seek; decode starts near the boundary
+    cmd += [
+        "-ss", f"{start:.6f}",
+        "-to", f"{end:.6f}",
+        "-i", input_path,
+        "-map", "0:v:0",
+        "-map", "0:a?",
+    ]
+
+    if gpu_frames:
+        cmd += ["-vf", "scale_cuda=trunc(iw/2)*2:trunc(ih/2)*2:format=nv12"]
+    elif vcodec in ("libx264", "libx265", "h264_nvenc", "hevc_nvenc"):
+        cmd += ["-vf", "scale=trunc(iw/2)*2:trunc(ih/2)*2"]
+
+    cmd += ["-c:v", vcodec]
+
+    if vcodec in ("libx264", "libx265"):
+        cmd += ["-crf", str(crf), "-preset", preset]
+    elif vcodec in ("h264_nvenc", "hevc_nvenc"):
+        nvenc_preset = preset if re.fullmatch(r"p[1-7]", preset) else DEFAULT_NVENC_PRESET
+        cmd += [
+            "-preset", nvenc_preset,
+            "-tune", "hq",
+            "-rc", "vbr",
+            "-cq", str(crf),
+            "-b:v", "0"
+        ]
+    else:
+        cmd += ["-preset", preset]
+
+    if not gpu_frames:
+        cmd += ["-pix_fmt", pix_fmt]
+    cmd += ["-c:a", acodec, "-b:a", abitrate]
+    cmd += [
+        "-avoid_negative_ts", "make_zero",
+        "-movflags", MOVFLAGS,
+        "-video_track_timescale", str(VIDEO_TRACK_TIMESCALE),
+        str(output_path)
+    ]
+
+    return cmd
+
+
+def run_parallel_reencode(
+    input_path: str,
+    outdir: Path,
+    chunk_seconds: float,
+    duration: float,
+    jobs: int,
+    vcodec: str,
+    acodec: str,
+    abitrate: str,
+    crf: int,
+    preset: str,
+    pix_fmt: str,
+    hwaccel: bool,
+    timeout: int
+) -> None:
+    """
+    Re-encode all segments concurrently, one ffmpeg process per time range.
+
+    x264 in a single process cannot saturate a many-core machine; sharding
+    the timeline across N concurrent encoders scales nearly linearly until
+    the cores (or disk) are pegged.
+
+    Args:
+        input_path: Path to input video
+        outdir: Output directory for segments
+        chunk_seconds: Duration of each segment
+        duration: Total video duration in seconds
+        jobs: Maximum concurrent ffmpeg processes
+        vcodec: Video codec to use
+        acodec: Audio codec to use
+        abitrate: Audio bitrate
+        crf: Constant rate factor for quality
+        preset: Encoder preset
+        pix_fmt: Pixel format
+        hwaccel: Whether to decode on the GPU
+        timeout: Per-process timeout in seconds
+
+    Raises:
+        RuntimeError: If any segment fails to encode
+    """
+    num_segments = int(math.ceil(duration / chunk_seconds))
+    jobs = max(1, min(jobs, num_segments, os.cpu_count() or 1))
+    logger.info(
+        f"Encoding {num_segments} segments with {jobs} parallel ffmpeg processes"
+    )
+
+    def encode_segment(index: int) -> None:
+        start = index * chunk_seconds
+        end = min((index + 1) * chunk_seconds, duration)
+        output_path = outdir / (SEGMENT_PATTERN % index)
+        cmd = build_single_segment_command(
+            input_path, output_path, start, end,
+            vcodec, acodec, abitrate, crf, preset, pix_fmt, hwaccel
+        )
+        run_ffmpeg(cmd, timeout=timeout)
+
+    # Threads are enough here - the actual work happens in the ffmpeg
+    # child processes, the workers just babysit them
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(encode_segment, i) for i in range(num_segments)
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
+
+
 def run_ffmpeg(cmd: list[str], timeout: int = FFMPEG_TIMEOUT_SECONDS) -> None:
     """
     Execute FFmpeg command with timeout and error handling.
@@ -305,18 +624,63 @@ def run_ffmpeg(cmd: list[str], timeout: int = FFMPEG_TIMEOUT_SECONDS) -> None:
     logger.info(f"Running FFmpeg with {timeout}s timeout...")
     logger.debug(f"Command: {' '.join(cmd)}")
 
-    try:
-        result = run_command(cmd, timeout=timeout)
-    except subprocess.TimeoutExpired:
-        logger.error(f"FFmpeg timed out after {timeout} seconds")
-        logger.error("This may indicate a corrupted video or an extremely long file")
-        sys.exit(1)
+    # Encoder chatter on stderr can reach GBs over a multi-hour run;
+    # spool it to a temp file instead of a pipe the Python process must
+    # drain line by line. Progress comes in on stdout via -progress,
+    # which ffmpeg itself throttles to key=value blocks ~2/sec, and
+    # -nostats drops the per-frame status line.
+    progress_cmd = [cmd[0], "-nostats", "-progress", "pipe:1"] + cmd[1:]
+    deadline = time.monotonic() + timeout
+    with tempfile.TemporaryFile() as stderr_log:
+        process = subprocess.Popen(
+            progress_cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=stderr_log,
+        )
+        # The per-line deadline check only runs when a progress line
+        # arrives; the watchdog also covers an encoder that hangs
+        # silently without closing stdout. Killing the process closes
+        # stdout, which unblocks the read loop.
+        timed_out = threading.Event()
+
+        def _kill_on_timeout() -> None:
+            timed_out.set()
+            process.kill()
+
+        watchdog = threading.Timer(timeout, _kill_on_timeout)
+        watchdog.start()
+        try:
+            for raw_line in process.stdout:
+                if timed_out.is_set() or time.monotonic() > deadline:
+                    raise subprocess.TimeoutExpired(progress_cmd, timeout)
+                line = raw_line.strip()
+                if line.startswith(b"out_time="):
+                    logger.debug(
+                        f"Encode progress: {line.decode('ascii', 'replace')}"
+                    )
+            returncode = process.wait(
+                timeout=max(1.0, deadline - time.monotonic())
+            )
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(progress_cmd, timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            logger.error(f"FFmpeg timed out after {timeout} seconds")
+            logger.error("This may indicate a corrupted video or an extremely long file")
+            sys.exit(1)
+        finally:
+            watchdog.cancel()
+            process.stdout.close()
 
-    if result.returncode != 0:
-        logger.error("FFmpeg command failed")
-        logger.error(f"Command: {' '.join(cmd)}")
-        logger.error(f"STDERR:\n{result.stderr}")
-        raise RuntimeError(f"ffmpeg failed with exit code {result.returncode}")
+        if returncode != 0:
+            stderr_log.seek(max(0, stderr_log.seek(0, os.SEEK_END) - 4096))
+            stderr_tail = stderr_log.read().decode("utf-8", "replace")
+            logger.error("FFmpeg command failed")
+            logger.error(f"Command: {' '.join(cmd)}")
+            logger.error(f"STDERR (tail):\n{stderr_tail}")
+            raise RuntimeError(f"ffmpeg failed with exit code {returncode}")
 
 
 def validate_segments(outdir: Path, expected_count: int) -> bool:
@@ -446,16 +810,41 @@ def main() -> None:
         "--stream-copy", action="store_true",
         help="Use stream copy (fast but less precise)"
     )
+    ap.add_argument(
+        "--hwaccel", action="store_true",
+        help="Use NVENC GPU encode/decode when available (falls back to CPU)"
+    )
+    ap.add_argument(
+        "--parallel", type=int, default=1,
+        help="Number of concurrent ffmpeg encodes for re-encode mode "
+             "(default: 1, clamped to CPU count)"
+    )
 
     args = ap.parse_args()
 
+    # Resolve hardware acceleration: swap the default CPU codecs for their
+    # NVENC counterparts, falling back to CPU when the build lacks NVENC
+    if args.hwaccel:
+        if nvenc_available():
+            if args.vcodec == "libx264":
+                args.vcodec = "h264_nvenc"
+            elif args.vcodec == "libx265":
+                args.vcodec = "hevc_nvenc"
+        else:
+            logger.warning(
+                "--hwaccel requested but NVENC is not available; "
+                "falling back to CPU encoding"
+            )
+            args.hwaccel = False
+
     # Validate inputs
     validate_input_file(args.input)
     outdir = validate_output_dir(args.outdir)
 
-    # Get video duration first (needed for --segments calculation)
+    # Get video duration first (needed for --segments calculation);
+    # the same probe reports the frame rate used for GOP sizing
     try:
-        duration = ffprobe_duration(args.input)
+        duration, fps = ffprobe_info(args.input)
     except RuntimeError as e:
         logger.error(f"Failed to get video duration: {e}")
         sys.exit(1)
@@ -480,6 +869,7 @@ def main() -> None:
 
     logger.info(f"Input: {args.input}")
     logger.info(f"Duration: {duration:.3f}s")
+    logger.info(f"Frame rate: {fps:.3f} fps")
     logger.info(f"Chunk size: {chunk_s:.3f}s")
     logger.info(f"Estimated segments: {est_segments}")
     logger.info(f"Output dir: {outdir}")
@@ -488,23 +878,56 @@ def main() -> None:
     retry_with_reencode = os.environ.get(
         'RETRY_WITH_REENCODE', 'true'
     ).lower() == 'true'
-    
-    # Build and run FFmpeg command
-    if args.stream_copy or not retry_with_reencode:
-        # Single-pass mode (user choice or retry disabled)
-        if args.stream_copy:
-            logger.info("Using stream copy mode (user requested)")
-            cmd = build_stream_copy_command(args.input, outdir, chunk_s)
+
+    def run_reencode() -> None:
+        """Run the re-encode, sharded across processes when --parallel > 1."""
+        if args.parallel > 1:
+            run_parallel_reencode(
+                args.input, outdir, chunk_s, duration, args.parallel,
+                args.vcodec, args.acodec, args.abitrate,
+                args.crf, args.preset, args.pix_fmt, args.hwaccel,
+                args.timeout
+            )
         else:
-            logger.info("Using re-encode mode (precise boundaries)")
             cmd = build_reencode_command(
                 args.input, outdir, chunk_s,
                 args.vcodec, args.acodec, args.abitrate,
-                args.crf, args.preset, args.pix_fmt, args.force_keyframes
+                args.crf, args.preset, args.pix_fmt, args.force_keyframes,
+                hwaccel=args.hwaccel, fps=fps
             )
-        
-        try:
             run_ffmpeg(cmd, timeout=args.timeout)
+
+    # Build and run FFmpeg command
+    if args.stream_copy or not retry_with_reencode:
+        # Single-pass mode (user choice or retry disabled)
+        try:
+            if args.stream_copy:
+                logger.info("Using stream copy mode (user requested)")
+                run_ffmpeg(
+                    build_stream_copy_command(args.input, outdir, chunk_s),
+                    timeout=args.timeout
+                )
+            else:
+                # Skip the encoder entirely when the source GOP already
+                # lands a keyframe on every boundary (common for CDN
+                # content) - stream copy gives the same cuts at I/O speed
+                aligned = False
+                try:
+                    aligned = keyframes_aligned(args.input, chunk_s, duration)
+                except RuntimeError as e:
+                    logger.warning(f"Keyframe alignment probe failed: {e}")
+                if aligned:
+                    logger.info(
+                        "Keyframes already aligned with boundaries - "
+                        "using stream copy instead of re-encode"
+                    )
+                    run_ffmpeg(
+                        build_stream_copy_command(args.input, outdir, chunk_s),
+                        timeout=args.timeout
+                    )
+                else:
+                    logger.info("Using re-encode mode (precise boundaries)")
+                    run_reencode()
         except RuntimeError:
             sys.exit(1)
     else:
@@ -532,21 +955,19 @@ def main() -> None:
                 
                 # Retry with re-encode
                 logger.info("Re-encoding with precise segment boundaries...")
-                cmd_reencode = build_reencode_command(
-                    args.input, outdir, chunk_s,
-                    args.vcodec, args.acodec, args.abitrate,
-                    args.crf, args.preset, args.pix_fmt,
-                    args.force_keyframes
-                )
-                run_ffmpeg(cmd_reencode, timeout=args.timeout)
-                
+                run_reencode()
+
                 logger.info("✅ Re-encode completed successfully")
         except RuntimeError:
             sys.exit(1)
 
-    # Count generated segments
-    segments = list(outdir.glob("seg_*.mp4"))
-    logger.info(f"✅ Done splitting. Generated {len(segments)} segments")
+    # Count generated segments; only the count is needed, so a scandir
+    # sweep beats glob materializing a Path per segment
+    segment_count = sum(
+        1 for entry in os.scandir(outdir)
+        if entry.name.startswith("seg_") and entry.name.endswith(".mp4")
+    )
+    logger.info(f"✅ Done splitting. Generated {segment_count} segments")
     logger.info(f"Segments written to: {outdir}")
 
 
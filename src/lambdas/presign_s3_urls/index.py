@@ -3,39 +3,106 @@
 Lambda handler for generating presigned S3 URLs.
 """
 
+import functools
+import hashlib
+import hmac
 import json
+import operator
 import os
-from typing import Any, Dict
+import threading
+import time
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Mapping, Optional, Tuple
+from urllib.parse import quote
 
 import boto3
+from botocore.config import Config
+
+# orjson parses API Gateway bodies and serializes result payloads several
+# times faster than the stdlib; fall back to stdlib json if the layer is
+# missing it.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+else:
+    _json_loads = json.loads
+    # Compact separators drop the space after every ':' and ',' — roughly
+    # 4% off the payload for URL-heavy bodies, and nothing parses these
+    # responses by eye. orjson is always compact.
+    _json_dumps = functools.partial(json.dumps, separators=(",", ":"))
 
 DEFAULT_EXPIRES_SECONDS = 6 * 60 * 60
 EXPIRES_ENV_VAR = "PRESIGN_EXPIRES_SECONDS"
 
-_S3_CLIENT = boto3.client("s3")
+# Shared pool for fanning out large batches; module scope so warm invocations
+# reuse the threads instead of paying thread startup per call.
+_EXECUTOR = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 4) * 4))
+
+# Resolve the regional endpoint once at cold start. Passing an explicit
+# endpoint_url makes botocore skip its endpoint-ruleset evaluation on every
+# generate_presigned_url call, which is pure CPU overhead for a Lambda that
+# only ever talks to S3 in its own region.
+_SESSION = boto3.session.Session()
+_REGION = _SESSION.region_name or "us-east-1"
+
+
+def _make_client() -> Any:
+    return _SESSION.client(
+        "s3",
+        endpoint_url=f"https://s3.{_REGION}.amazonaws.com",
+        config=Config(signature_version="s3v4"),
+    )
+
+
+# PRESIGN_LAZY_INIT=1 defers client construction and warmup to first use.
+# Default is eager: init-phase CPU is free with provisioned concurrency, so
+# lazy init only helps deployments that invoke this Lambda rarely and care
+# about cold-start latency of unrelated code paths.
+_LAZY_INIT = os.environ.get("PRESIGN_LAZY_INIT", "").lower() in {"1", "true", "yes"}
+_S3_CLIENT = None if _LAZY_INIT else _make_client()
+
+
+def _ensure_client() -> Any:
+    global _S3_CLIENT
+    if _S3_CLIENT is None:
+        _S3_CLIENT = _make_client()
+    return _S3_CLIENT
 
 
-def _parse_event(event: Any) -> Dict[str, Any]:
+def _parse_event(event: Any) -> Mapping[str, Any]:
+    # Dict events are the overwhelmingly common shape (direct invocation
+    # and API Gateway both deliver dicts), so check for them first; the
+    # exact-type test short-circuits before the subclass-aware isinstance.
+    # A direct invocation without a body returns in two type checks.
+    if type(event) is dict or isinstance(event, dict):
+        body = event.get("body")
+        if type(body) is not str:
+            return event
+        try:
+            parsed_body = _json_loads(body)
+        except json.JSONDecodeError:
+            return event
+        if isinstance(parsed_body, dict):
+            # ChainMap layers the parsed body over the envelope without
+            # copying either dict; body keys shadow envelope keys just
+            # like the old copy-and-update did.
+            return ChainMap(parsed_body, event)
+        return event
     if event is None:
         return {}
     if isinstance(event, str):
         try:
-            return json.loads(event)
+            return _json_loads(event)
         except json.JSONDecodeError as exc:
             raise ValueError("Event string must be JSON.") from exc
-    if isinstance(event, dict):
-        body = event.get("body")
-        if isinstance(body, str):
-            try:
-                parsed_body = json.loads(body)
-            except json.JSONDecodeError:
-                parsed_body = {}
-            if isinstance(parsed_body, dict):
-                merged = dict(event)
-                merged.pop("body", None)
-                merged.update(parsed_body)
-                return merged
-        return event
     raise ValueError("Event must be a dict or JSON string.")
 
 
@@ -46,13 +113,22 @@ def _coerce_int(value: Any, field_name: str) -> int:
         raise ValueError(f"{field_name} must be an integer.") from exc
 
 
+# Lambda environment variables are immutable for the lifetime of a container,
+# so resolve and validate the env override once at cold start instead of
+# doing a getenv + int() on every invocation. A malformed value now fails
+# the cold start rather than every request.
+_ENV_EXPIRES_RAW = os.environ.get(EXPIRES_ENV_VAR)
+_ENV_EXPIRES: Optional[int] = (
+    _coerce_int(_ENV_EXPIRES_RAW, EXPIRES_ENV_VAR) if _ENV_EXPIRES_RAW else None
+)
+
+
 def _get_expires_seconds(event: Dict[str, Any]) -> int:
     event_override = event.get("presign_expires")
     if event_override is not None:
         expires = _coerce_int(event_override, "presign_expires")
     else:
-        env_override = os.environ.get(EXPIRES_ENV_VAR)
-        expires = _coerce_int(env_override, EXPIRES_ENV_VAR) if env_override else None
+        expires = _ENV_EXPIRES
     if expires is None:
         expires = DEFAULT_EXPIRES_SECONDS
     if expires <= 0:
@@ -67,13 +143,123 @@ def _require_field(event: Dict[str, Any], field: str) -> str:
     return value
 
 
-def _presign_get(bucket: str, key: str, expires: int) -> str:
-    return _S3_CLIENT.generate_presigned_url(
-        "get_object",
-        Params={"Bucket": bucket, "Key": key},
-        ExpiresIn=expires,
+# Per-thread signing context: frozen credentials plus the region/endpoint
+# derived from the active client. Thread-local storage keeps pool workers
+# off a shared mutable global (no lock, no cross-thread cache-line traffic);
+# the context is keyed on client identity so swapping _S3_CLIENT (tests do)
+# re-resolves it.
+_SIGNING_CTX = threading.local()
+
+
+def _signing_context(client: Any) -> Tuple[Any, Any, str, str, str]:
+    ctx = getattr(_SIGNING_CTX, "value", None)
+    if ctx is not None and ctx[0] is client:
+        return ctx
+    creds = client._request_signer._credentials.get_frozen_credentials()
+    region = client.meta.region_name or _REGION
+    endpoint = client.meta.endpoint_url
+    host = endpoint.split("://", 1)[1]
+    ctx = (client, creds, region, endpoint, host)
+    _SIGNING_CTX.value = ctx
+    return ctx
+
+
+@functools.lru_cache(maxsize=4)
+def _signing_key(secret_key: str, date_stamp: str, region: str) -> bytes:
+    """
+    Derive the SigV4 signing key (four chained HMAC-SHA256 rounds).
+
+    The key only changes when the UTC date rolls over or credentials
+    rotate, so memoizing it turns four HMAC rounds per URL into a cache
+    hit; a few entries cover the date boundary and a credential swap.
+    """
+    k = hmac.new(b"AWS4" + secret_key.encode(), date_stamp.encode(), hashlib.sha256).digest()
+    k = hmac.new(k, region.encode(), hashlib.sha256).digest()
+    k = hmac.new(k, b"s3", hashlib.sha256).digest()
+    return hmac.new(k, b"aws4_request", hashlib.sha256).digest()
+
+
+def _sigv4_presign(
+    method: str,
+    bucket: str,
+    key: str,
+    expires: int,
+    headers: Optional[Dict[str, str]] = None,
+) -> str:
+    """
+    Build a SigV4 query-string presigned URL without going through botocore.
+
+    generate_presigned_url runs the full request-serialization and event
+    pipeline per call; presigning is pure local computation, so doing the
+    canonical-request/HMAC math directly is an order of magnitude cheaper
+    for large batches. URLs are path-style against the client's endpoint.
+    """
+    client = _S3_CLIENT if _S3_CLIENT is not None else _ensure_client()
+    _, creds, region, endpoint, host = _signing_context(client)
+    canonical_uri = f"/{bucket}/{quote(key, safe='/~')}"
+
+    now = time.gmtime()
+    amz_date = time.strftime("%Y%m%dT%H%M%SZ", now)
+    date_stamp = amz_date[:8]
+    scope = f"{date_stamp}/{region}/s3/aws4_request"
+
+    header_items = [("host", host)]
+    if headers:
+        header_items.extend((k.lower(), v) for k, v in headers.items())
+        header_items.sort()
+    signed_headers = ";".join(k for k, _ in header_items)
+    canonical_headers = "".join(f"{k}:{v}\n" for k, v in header_items)
+
+    params = [
+        ("X-Amz-Algorithm", "AWS4-HMAC-SHA256"),
+        ("X-Amz-Credential", f"{creds.access_key}/{scope}"),
+        ("X-Amz-Date", amz_date),
+        ("X-Amz-Expires", str(expires)),
+        ("X-Amz-SignedHeaders", signed_headers),
+    ]
+    if creds.token:
+        params.append(("X-Amz-Security-Token", creds.token))
+        params.sort()
+    canonical_query = "&".join(
+        f"{quote(k, safe='')}={quote(v, safe='')}" for k, v in params
     )
 
+    canonical_request = "\n".join((
+        method,
+        canonical_uri,
+        canonical_query,
+        canonical_headers,
+        signed_headers,
+        "UNSIGNED-PAYLOAD",
+    ))
+    string_to_sign = "\n".join((
+        "AWS4-HMAC-SHA256",
+        amz_date,
+        scope,
+        hashlib.sha256(canonical_request.encode()).hexdigest(),
+    ))
+    signature = hmac.new(
+        _signing_key(creds.secret_key, date_stamp, region),
+        string_to_sign.encode(),
+        hashlib.sha256,
+    ).hexdigest()
+    return f"{endpoint}{canonical_uri}?{canonical_query}&X-Amz-Signature={signature}"
+
+
+# Warm the signing path during init, where Lambda grants boosted CPU that is
+# otherwise wasted: one throwaway presign resolves and freezes credentials so
+# the first real invocation skips the provider chain. Warmup must never make
+# a cold start fail, hence the blanket except.
+if not _LAZY_INIT:
+    try:
+        _sigv4_presign("GET", "warmup", "warmup", 60)
+    except Exception:
+        pass
+
+
+def _presign_get(bucket: str, key: str, expires: int) -> str:
+    return _sigv4_presign("GET", bucket, key, expires)
+
 def _presign_put(
     bucket: str,
     key: str,
@@ -94,92 +280,196 @@ def _presign_put(
     Returns:
     str: The presigned URL.
     """
-    params = {"Bucket": bucket, "Key": key}
-    
+    headers = {}
+
     if server_side_encryption:
-        params["ServerSideEncryption"] = server_side_encryption
-    
+        headers["x-amz-server-side-encryption"] = server_side_encryption
+
     if content_type:
-        params["ContentType"] = content_type
-    
-    return _S3_CLIENT.generate_presigned_url(
-        "put_object",
-        Params=params,
-        ExpiresIn=expires,
+        headers["content-type"] = content_type
+
+    return _sigv4_presign("PUT", bucket, key, expires, headers or None)
+
+
+def _presign_get_request(
+    request: Dict[str, Any], bucket: str, key: str, expires: int
+) -> str:
+    return _presign_get(bucket, key, expires)
+
+
+def _presign_put_request(
+    request: Dict[str, Any], bucket: str, key: str, expires: int
+) -> str:
+    return _presign_put(
+        bucket,
+        key,
+        expires,
+        request.get("server_side_encryption"),
+        request.get("content_type"),
     )
 
 
+# Dispatch table keyed on both common spellings so the hot path is a single
+# dict probe; mixed-case values fall back to one .lower() before erroring.
+_OPS = {
+    "get": ("get", _presign_get_request),
+    "put": ("put", _presign_put_request),
+    "GET": ("get", _presign_get_request),
+    "PUT": ("put", _presign_put_request),
+}
+
+
+# Extracts the three required fields in one call; raises KeyError naming
+# the first missing field.
+_REQUIRED_FIELDS = operator.itemgetter("bucket", "key", "operation")
+
+# Success results always carry the same keys in the same order; copying a
+# pre-shaped template is cheaper than rebuilding the dict shape per request.
+_RESULT_TEMPLATE = dict.fromkeys(
+    ("success", "bucket", "key", "operation", "url", "expires_in")
+)
+
+
+def _error_result(request: Dict[str, Any], message: str) -> Dict[str, Any]:
+    error_result = {
+        "success": False,
+        "error": message,
+        "request": request,
+    }
+
+    # Include name in error response if provided
+    name = request.get("name")
+    if name is not None:
+        error_result["name"] = name
+
+    return error_result
+
+
 def _process_single_request(
     request: Dict[str, Any],
     default_expires: int,
 ) -> Dict[str, Any]:
     """
     Process a single presigning request.
-    
+
     Parameters:
     request (dict): The request containing bucket, key, operation, and options.
     default_expires (int): Default expiration time in seconds.
-    
+
     Returns:
     dict: Result containing the presigned URL or error information.
     """
+    # Validation failures return error dicts directly instead of raising;
+    # building and unwinding an exception per malformed request is far more
+    # expensive than a branch, and malformed batches are not exceptional
+    # here. The three required fields come out in one C-level itemgetter
+    # call rather than three dict.get calls; only genuinely malformed
+    # requests pay the KeyError. The signing call keeps its own try for
+    # unexpected failures like credential problems.
     try:
-        bucket = _require_field(request, "bucket")
-        key = _require_field(request, "key")
-        operation = _require_field(request, "operation").lower()
-        name = request.get("name")
-        
-        # Get expiration time (request-specific or default)
-        expires = request.get("expires", default_expires)
-        expires = _coerce_int(expires, "expires")
-        
-        if expires <= 0:
-            raise ValueError("expires must be positive.")
-        
-        # Generate presigned URL based on operation type
-        if operation == "get":
-            url = _presign_get(bucket, key, expires)
-        elif operation == "put":
-            server_side_encryption = request.get("server_side_encryption")
-            content_type = request.get("content_type")
-            url = _presign_put(
-                bucket,
-                key,
-                expires,
-                server_side_encryption,
-                content_type,
-            )
-        else:
-            raise ValueError(f"Invalid operation: {operation}. Must be 'get' or 'put'.")
-        
-        result = {
-            "success": True,
-            "bucket": bucket,
-            "key": key,
-            "operation": operation,
-            "url": url,
-            "expires_in": expires,
-        }
-        
-        # Include name in response if provided
-        if name is not None:
-            result["name"] = name
-        
-        return result
-    
+        bucket, key, operation = _REQUIRED_FIELDS(request)
+    except KeyError as exc:
+        return _error_result(request, f"Missing required field: {exc.args[0]}")
+    if not bucket:
+        return _error_result(request, "Missing required field: bucket")
+    if not key:
+        return _error_result(request, "Missing required field: key")
+    if not operation:
+        return _error_result(request, "Missing required field: operation")
+    name = request.get("name")
+
+    if isinstance(operation, str):
+        dispatch = _OPS.get(operation)
+        if dispatch is None:
+            # Only mixed-case spellings ("Get") reach the .lower()
+            # allocation; "get"/"put"/"GET"/"PUT" hit the table directly.
+            dispatch = _OPS.get(operation.lower())
+    else:
+        dispatch = None
+    if dispatch is None:
+        return _error_result(
+            request,
+            f"Invalid operation: {str(operation).lower()}. Must be 'get' or 'put'.",
+        )
+    operation, presign = dispatch
+
+    # Get expiration time (request-specific or default)
+    expires = request.get("expires", default_expires)
+    if type(expires) is not int:
+        try:
+            expires = int(expires)
+        except (TypeError, ValueError):
+            return _error_result(request, "expires must be an integer.")
+    if expires <= 0:
+        return _error_result(request, "expires must be positive.")
+
+    try:
+        url = presign(request, bucket, key, expires)
     except Exception as exc:
-        error_result = {
-            "success": False,
-            "error": str(exc),
-            "request": request,
-        }
-        
-        # Include name in error response if provided
+        return _error_result(request, str(exc))
+
+    result = _RESULT_TEMPLATE.copy()
+    result["success"] = True
+    result["bucket"] = bucket
+    result["key"] = key
+    result["operation"] = operation
+    result["url"] = url
+    result["expires_in"] = expires
+
+    # Include name in response if provided
+    if name is not None:
+        result["name"] = name
+
+    return result
+
+
+def _try_homogeneous_batch(
+    requests: list,
+    default_expires: int,
+) -> Optional[list]:
+    """
+    Fast path for manifest-style batches: when every request presigns GETs
+    against one bucket with the batch-level expiry, validate bucket and
+    operation once and run a tight per-key signing loop instead of
+    re-validating identical fields thousands of times. Returns None for
+    mixed batches, which take the general per-request path.
+    """
+    first = requests[0]
+    bucket = first.get("bucket")
+    operation = first.get("operation")
+    if not bucket or operation not in ("get", "GET"):
+        return None
+    for request in requests:
+        if (
+            request.get("bucket") != bucket
+            or request.get("operation") != operation
+            or "expires" in request
+        ):
+            return None
+
+    results = [None] * len(requests)
+    for i, request in enumerate(requests):
+        key = request.get("key")
+        if not key:
+            results[i] = _error_result(request, "Missing required field: key")
+            continue
+        try:
+            url = _presign_get(bucket, key, default_expires)
+        except Exception as exc:
+            results[i] = _error_result(request, str(exc))
+            continue
+        result = _RESULT_TEMPLATE.copy()
+        result["success"] = True
+        result["bucket"] = bucket
+        result["key"] = key
+        result["operation"] = "get"
+        result["url"] = url
+        result["expires_in"] = default_expires
         name = request.get("name")
         if name is not None:
-            error_result["name"] = name
-        
-        return error_result
+            result["name"] = name
+        results[i] = result
+    return results
 
 
 def lambda_handler(event: Any, context: Any) -> Dict[str, Any]:
@@ -208,7 +498,7 @@ def lambda_handler(event: Any, context: Any) -> Dict[str, Any]:
         if not requests:
             return {
                 "statusCode": 400,
-                "body": json.dumps({
+                "body": _json_dumps({
                     "error": "Missing required field: requests",
                 }),
             }
@@ -216,27 +506,46 @@ def lambda_handler(event: Any, context: Any) -> Dict[str, Any]:
         if not isinstance(requests, list):
             return {
                 "statusCode": 400,
-                "body": json.dumps({
+                "body": _json_dumps({
                     "error": "Field 'requests' must be an array",
                 }),
             }
         
-        # Process each request
-        results = [
-            _process_single_request(req, default_expires)
-            for req in requests
-        ]
-        
-        # Check if any requests failed
-        failed_count = sum(1 for r in results if not r.get("success"))
-        success_count = len(results) - failed_count
-        
+        # Process each request; batches go through the shared thread pool
+        # (HMAC hashing releases the GIL, and warm pools amortize thread
+        # startup). A single request is cheaper to run inline.
+        total = len(requests)
+        results = _try_homogeneous_batch(requests, default_expires) if total > 1 else None
+        if results is not None:
+            failed_count = sum(1 for r in results if not r.get("success"))
+        else:
+            if total > 1:
+                mapped = _EXECUTOR.map(
+                    lambda req: _process_single_request(req, default_expires),
+                    requests,
+                )
+            else:
+                mapped = (
+                    _process_single_request(req, default_expires)
+                    for req in requests
+                )
+
+            # Pre-size the results list and tally failures while filling it,
+            # instead of growing a list and then re-scanning it.
+            results = [None] * total
+            failed_count = 0
+            for i, result in enumerate(mapped):
+                results[i] = result
+                if not result.get("success"):
+                    failed_count += 1
+        success_count = total - failed_count
+
         return {
             "statusCode": 200 if failed_count == 0 else 207,  # 207 Multi-Status if partial success
-            "body": json.dumps({
+            "body": _json_dumps({
                 "results": results,
                 "summary": {
-                    "total": len(results),
+                    "total": total,
                     "successful": success_count,
                     "failed": failed_count,
                 },
@@ -246,7 +555,7 @@ def lambda_handler(event: Any, context: Any) -> Dict[str, Any]:
     except Exception as exc:
         return {
             "statusCode": 500,
-            "body": json.dumps({
+            "body": _json_dumps({
                 "error": f"Internal error: {str(exc)}",
             }),
         }
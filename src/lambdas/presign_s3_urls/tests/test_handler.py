@@ -135,13 +135,15 @@ class TestGetExpiresSeconds:
         assert _get_expires_seconds(event) == 3600
 
     def test_env_override(self, monkeypatch):
-        """Test environment variable override."""
-        monkeypatch.setenv(EXPIRES_ENV_VAR, "7200")
+        """Test environment variable override (resolved at cold start)."""
+        import index
+        monkeypatch.setattr(index, "_ENV_EXPIRES", 7200)
         assert _get_expires_seconds({}) == 7200
 
     def test_event_takes_precedence_over_env(self, monkeypatch):
         """Test event override takes precedence over env var."""
-        monkeypatch.setenv(EXPIRES_ENV_VAR, "7200")
+        import index
+        monkeypatch.setattr(index, "_ENV_EXPIRES", 7200)
         event = {"presign_expires": 1800}
         assert _get_expires_seconds(event) == 1800
 
@@ -18,43 +18,181 @@ DynamoDB Schema:
         - result (map, optional) - Job result metadata
 """
 
+import functools
 import json
 import logging
 import os
-from datetime import datetime, timezone
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+# orjson parses webhook bodies and serializes responses several times
+# faster than the stdlib; fall back to stdlib json if the layer is
+# missing it.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any, default: Any = None) -> str:
+        return orjson.dumps(obj, default=default).decode("utf-8")
+else:
+    _json_loads = json.loads
+    _json_dumps = functools.partial(json.dumps, separators=(",", ":"))
+
 logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 
-sfn_client = boto3.client("stepfunctions")
-dynamodb = boto3.resource("dynamodb")
+
+# Fan-out pool for SQS batches: each record needs its own conditional
+# claim and Step Functions call (neither has a batch API), so overlap
+# them instead of paying one round-trip after another. Sized to the
+# maximum SQS batch the trigger delivers.
+_EXECUTOR = ThreadPoolExecutor(max_workers=10)
+
+# Keep TCP+TLS sessions warm across invocations in the same container:
+# keep-alive stops idle sockets from being torn down during freezes, the
+# pool covers concurrent calls, and adaptive retries back off under
+# throttling instead of hammering.
+_BOTO_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=10,
+    retries={"mode": "adaptive", "max_attempts": 5},
+)
+
+sfn_client = boto3.client("stepfunctions", config=_BOTO_CONFIG)
+# Low-level client rather than the resource API: the resource layer walks
+# every item through TypeSerializer/TypeDeserializer (ints become Decimal,
+# every value gets reflected on). The schema here is tiny and fixed, so
+# hand-formed AttributeValue dicts skip that per-call overhead entirely.
+ddb_client = boto3.client("dynamodb", config=_BOTO_CONFIG)
 
 # Environment variables
 CALLBACK_TABLE_NAME = os.environ["CALLBACK_TABLE_NAME"]
 
-table = dynamodb.Table(CALLBACK_TABLE_NAME)
+# Prime the HTTPS pools during the init phase, which gets boosted CPU and
+# is free under provisioned concurrency: one cheap call per client performs
+# DNS + TCP + TLS setup so the first real invocation reuses pooled sockets
+# instead of paying the handshakes on request latency. Best-effort only.
+try:
+    sfn_client.list_state_machines(maxResults=1)
+    ddb_client.describe_table(TableName=CALLBACK_TABLE_NAME)
+except Exception:
+    pass
 
 
-def get_callback_record(callback_token: str) -> Optional[dict[str, Any]]:
+def _iso_now() -> str:
+    """UTC timestamp in ISO-8601 form at second resolution.
+
+    time.strftime over gmtime skips datetime/tzinfo object construction,
+    which is measurable on a path that stamps every write.
     """
-    Retrieve callback record from DynamoDB.
-    
+    return time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime())
+
+
+def _attr_value(value: Any) -> dict[str, Any]:
+    """Wrap a Python value in its DynamoDB AttributeValue form."""
+    if isinstance(value, str):
+        return {"S": value}
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if isinstance(value, (int, float)):
+        return {"N": str(value)}
+    if isinstance(value, dict):
+        return {"M": {k: _attr_value(v) for k, v in value.items()}}
+    if isinstance(value, list):
+        return {"L": [_attr_value(v) for v in value]}
+    if value is None:
+        return {"NULL": True}
+    return {"S": str(value)}
+
+
+def _plain_value(attr: dict[str, Any]) -> Any:
+    """Unwrap a single DynamoDB AttributeValue into a plain Python value."""
+    (tag, value), = attr.items()
+    if tag == "N":
+        return float(value) if "." in value else int(value)
+    if tag == "M":
+        return _deserialize_item(value)
+    if tag == "L":
+        return [_plain_value(element) for element in value]
+    if tag == "NULL":
+        return None
+    return value
+
+
+def _deserialize_item(item: dict[str, Any]) -> dict[str, Any]:
+    """Unwrap a low-level DynamoDB item into plain Python values."""
+    return {name: _plain_value(attr) for name, attr in item.items()}
+
+
+def get_callback_records_batch(callback_tokens: list[str]) -> dict[str, dict[str, Any]]:
+    """
+    Retrieve multiple callback records with BatchGetItem.
+
+    When RunPod finishes a multi-segment job it delivers a burst of
+    callbacks; one BatchGetItem round-trip per 100 tokens replaces one
+    GetItem round-trip per token. Unprocessed keys are retried with
+    exponential backoff, as DynamoDB may partially serve a batch under
+    throttling.
+
     Args:
-        callback_token: Unique callback token
-        
+        callback_tokens: Callback tokens to look up
+
     Returns:
-        DynamoDB item or None if not found
+        Mapping of callback_token to the DynamoDB item (missing tokens
+        are absent from the result)
     """
-    try:
-        response = table.get_item(Key={"callback_token": callback_token})
-        return response.get("Item")
-    except ClientError as e:
-        logger.error(f"Error retrieving callback record: {e}")
-        raise
+    records: dict[str, dict[str, Any]] = {}
+    for start in range(0, len(callback_tokens), 100):
+        chunk = callback_tokens[start:start + 100]
+        request_items = {
+            CALLBACK_TABLE_NAME: {
+                "Keys": [{"callback_token": {"S": token}} for token in chunk]
+            }
+        }
+        backoff = 0.05
+        while request_items:
+            try:
+                response = ddb_client.batch_get_item(
+                    RequestItems=request_items
+                )
+            except ClientError as e:
+                logger.error(f"Error batch-reading callback records: {e}")
+                raise
+            for item in response.get("Responses", {}).get(CALLBACK_TABLE_NAME, []):
+                record = _deserialize_item(item)
+                records[record["callback_token"]] = record
+            request_items = response.get("UnprocessedKeys") or None
+            if request_items:
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 1.0)
+    return records
+
+
+# Terminal RunPod failure statuses mapped to their Step Functions error
+# codes; also serves as the membership check for the failure branch.
+_ERROR_CODES = {
+    "FAILED": "RunPodFAILED",
+    "CANCELLED": "RunPodCANCELLED",
+    "TIMED_OUT": "RunPodTIMEDOUT",
+}
+
+# The update expressions only come in two shapes (with and without a
+# result blob); build them and the attribute-name maps once at import
+# instead of by string concatenation on every call.
+_UPDATE_EXPR = "SET #status = :status, completed_at = :completed_at"
+_UPDATE_EXPR_WITH_RESULT = _UPDATE_EXPR + ", #result = :result"
+_UPDATE_ATTR_NAMES = {"#status": "status"}
+_UPDATE_ATTR_NAMES_WITH_RESULT = {"#status": "status", "#result": "result"}
+_CLAIM_CONDITION = "attribute_exists(callback_token) AND #status = :pending"
 
 
 def update_callback_completed(
@@ -71,22 +209,21 @@ def update_callback_completed(
         result: Optional result metadata
     """
     try:
-        update_expr = "SET #status = :status, completed_at = :completed_at"
-        expr_attr_names = {"#status": "status"}
         expr_attr_values = {
-            ":status": status,
-            ":completed_at": datetime.now(timezone.utc).isoformat()
+            ":status": {"S": status},
+            ":completed_at": {"S": _iso_now()}
         }
         
         if result:
-            update_expr += ", #result = :result"
-            expr_attr_names["#result"] = "result"
-            expr_attr_values[":result"] = result
+            expr_attr_values[":result"] = _attr_value(result)
         
-        table.update_item(
-            Key={"callback_token": callback_token},
-            UpdateExpression=update_expr,
-            ExpressionAttributeNames=expr_attr_names,
+        ddb_client.update_item(
+            TableName=CALLBACK_TABLE_NAME,
+            Key={"callback_token": {"S": callback_token}},
+            UpdateExpression=_UPDATE_EXPR_WITH_RESULT if result else _UPDATE_EXPR,
+            ExpressionAttributeNames=(
+                _UPDATE_ATTR_NAMES_WITH_RESULT if result else _UPDATE_ATTR_NAMES
+            ),
             ExpressionAttributeValues=expr_attr_values
         )
         logger.info(f"Updated callback record {callback_token} to status {status}")
@@ -94,12 +231,284 @@ def update_callback_completed(
         logger.error(f"Error updating callback record: {e}")
         raise
 
+def complete_callback(
+    callback_token: str,
+    status: str,
+    result: Optional[dict[str, Any]] = None
+) -> dict[str, Any]:
+    """
+    Atomically claim a PENDING callback and flip it to its final status.
+
+    A single conditional UpdateItem replaces the earlier get -> check ->
+    update sequence: it halves the DynamoDB calls on the happy path and
+    closes the race where two concurrent RunPod retries both pass the
+    "already completed" check. The previous attributes come back via
+    ReturnValues=ALL_OLD, so no prior GetItem is needed to recover the
+    task token.
+
+    Args:
+        callback_token: Unique callback token
+        status: COMPLETED or FAILED
+        result: Optional result metadata
+
+    Returns:
+        The UpdateItem response; Attributes holds the old item in
+        low-level AttributeValue form
+
+    Raises:
+        ClientError: ConditionalCheckFailedException when the token does
+            not exist or was already completed (the old item, if any, is
+            in the error response)
+    """
+    expr_attr_values = {
+        ":status": {"S": status},
+        ":pending": {"S": "PENDING"},
+        ":completed_at": {"S": _iso_now()}
+    }
+
+    if result:
+        expr_attr_values[":result"] = _attr_value(result)
+
+    return ddb_client.update_item(
+        TableName=CALLBACK_TABLE_NAME,
+        Key={"callback_token": {"S": callback_token}},
+        UpdateExpression=_UPDATE_EXPR_WITH_RESULT if result else _UPDATE_EXPR,
+        ConditionExpression=_CLAIM_CONDITION,
+        ExpressionAttributeNames=(
+            _UPDATE_ATTR_NAMES_WITH_RESULT if result else _UPDATE_ATTR_NAMES
+        ),
+        ExpressionAttributeValues=expr_attr_values,
+        ReturnValues="ALL_OLD",
+        ReturnValuesOnConditionCheckFailure="ALL_OLD"
+    )
+
+
+def process_callback(
+    callback_token: str,
+    body: dict[str, Any],
+    record: Optional[dict[str, Any]] = None
+) -> dict[str, Any]:
+    """
+    Process a single RunPod callback.
+
+    Shared by the API Gateway single-event path and the SQS batch path.
+    The idempotency check and status flip happen in one conditional
+    UpdateItem; a prefetched record (batch path) only serves as a cheap
+    pre-filter to skip the write for known-completed callbacks.
+
+    Args:
+        callback_token: Unique callback token
+        body: Parsed RunPod webhook payload
+        record: Optional prefetched DynamoDB record (batch path)
+
+    Returns:
+        API Gateway-style response dict
+    """
+    job_id = body.get("id", "unknown")
+    status = body.get("status", "UNKNOWN")
+
+    logger.info(f"Processing RunPod job {job_id} with status {status} for callback {callback_token}")
+
+    # Cheap pre-filter when a prefetched record is available (batch path):
+    # skip the conditional write for callbacks we already know are final.
+    if record is not None and record.get("status") in ("COMPLETED", "FAILED"):
+        logger.info(f"Callback {callback_token} already {record.get('status')}, returning 200 back to RunPod")
+        return {
+            "statusCode": 200,
+            "body": _json_dumps({
+                "message": "Callback already processed",
+                "completed_at": record.get("completed_at")
+            })
+        }
+
+    # Decide the terminal state up front; unexpected statuses never touch
+    # DynamoDB or Step Functions.
+    if status == "COMPLETED":
+        final_status = "COMPLETED"
+        result = {
+            "job_id": job_id,
+            "runpod_status": status,
+            "output": body.get("output", {})
+        }
+    elif status in _ERROR_CODES:
+        final_status = "FAILED"
+        error_message = body.get("error", f"RunPod job {status}")
+        result = {
+            "job_id": job_id,
+            "runpod_status": status,
+            "error": error_message
+        }
+    else:
+        # Unexpected status - log but return success (don't retry)
+        logger.warning(f"Unexpected status '{status}' for job {job_id}, ignoring")
+        return {
+            "statusCode": 200,
+            "body": _json_dumps({
+                "message": f"Ignored unexpected status: {status}"
+            })
+        }
+
+    # 1. Claim the callback: idempotency check + status flip in one write
+    try:
+        update_response = complete_callback(callback_token, final_status, result)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+            old_item = e.response.get("Item")
+            if old_item:
+                # Already processed by a concurrent or earlier delivery.
+                # The old image comes back in low-level AttributeValue
+                # form on the error response.
+                completed_at = old_item.get("completed_at", {}).get("S")
+                logger.info(f"Callback {callback_token} already processed, returning 200 back to RunPod")
+                return {
+                    "statusCode": 200,
+                    "body": _json_dumps({
+                        "message": "Callback already processed",
+                        "completed_at": completed_at
+                    })
+                }
+            logger.warning(f"Callback token {callback_token} not found in DynamoDB")
+            return {
+                "statusCode": 404,
+                "body": _json_dumps({"error": "Callback token not found"})
+            }
+        raise
+
+    old_record = _deserialize_item(update_response.get("Attributes") or {})
+    task_token = old_record.get("task_token")
+    if not task_token:
+        logger.error(f"No task_token found in record for callback {callback_token}")
+        return {
+            "statusCode": 500,
+            "body": _json_dumps({"error": "Missing task_token in record"})
+        }
+
+    # 2. Resume Step Functions. The success and failure paths share their
+    # TaskTimedOut/InvalidToken handling, so pick the SFN call up front and
+    # run it through a single try/except ladder.
+    if final_status == "COMPLETED":
+        output = {
+            "job_id": job_id,
+            "status": status,
+            "callback_token": callback_token,
+            "exec_id": old_record.get("exec_id"),
+            "segment_filename": old_record.get("segment_filename"),
+            "output": body.get("output", {})
+        }
+
+        def sfn_call() -> None:
+            sfn_client.send_task_success(
+                taskToken=task_token,
+                output=_json_dumps(output)
+            )
+
+        sent_log = f"Sent TaskSuccess for job {job_id}"
+    else:
+        def sfn_call() -> None:
+            sfn_client.send_task_failure(
+                taskToken=task_token,
+                error=_ERROR_CODES[status],
+                cause=error_message
+            )
+
+        sent_log = f"Sent TaskFailure for job {job_id}: {error_message}"
+
+    try:
+        sfn_call()
+        logger.info(sent_log)
+
+    except sfn_client.exceptions.TaskTimedOut:
+        logger.error(f"Task token expired for callback {callback_token}")
+        # Record the late delivery; the status is already final
+        update_callback_completed(
+            callback_token=callback_token,
+            status=final_status,
+            result={"error": "Task token expired", "job_id": job_id}
+        )
+        return {
+            "statusCode": 410,
+            "body": _json_dumps({"error": "Task token expired"})
+        }
+    except sfn_client.exceptions.InvalidToken:
+        logger.error(f"Invalid task token for callback {callback_token}")
+        update_callback_completed(
+            callback_token=callback_token,
+            status="FAILED",
+            result={"error": "Invalid task token", "job_id": job_id}
+        )
+        return {
+            "statusCode": 400,
+            "body": _json_dumps({"error": "Invalid task token"})
+        }
+
+    return {
+        "statusCode": 200,
+        "body": _json_dumps({
+            "message": "Webhook processed successfully",
+            "job_id": job_id,
+            "status": status
+        })
+    }
+
+
+def _handle_sqs_batch(sqs_records: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Handle a batch of webhook callbacks delivered via SQS.
+
+    Each SQS message body is the RunPod payload plus the callback_token.
+    All records are fetched in one BatchGetItem pass up front, then each
+    callback is dispatched against its record. Failures are reported per
+    message (ReportBatchItemFailures) so SQS only redelivers the records
+    that actually failed.
+    """
+    parsed: list[tuple[Optional[str], Optional[str], dict[str, Any]]] = []
+    for sqs_record in sqs_records:
+        raw_body = sqs_record.get("body")
+        try:
+            body = _json_loads(raw_body) if isinstance(raw_body, str) else (raw_body or {})
+        except json.JSONDecodeError:
+            logger.error(f"SQS record {sqs_record.get('messageId')} has malformed JSON body, dropping")
+            body = {}
+        parsed.append((sqs_record.get("messageId"), body.get("callback_token"), body))
+
+    tokens = [token for _, token, _ in parsed if token]
+    records = get_callback_records_batch(tokens) if tokens else {}
+
+    # The conditional claim and the SFN call have no batch API, so the
+    # per-record round-trips are overlapped on the executor; batch latency
+    # becomes the slowest record instead of the sum.
+    futures = []
+    failures: list[dict[str, str]] = []
+    for message_id, callback_token, body in parsed:
+        if not callback_token:
+            logger.error(f"SQS record {message_id} missing callback_token, dropping")
+            continue
+        record = records.get(callback_token)
+        if not record:
+            logger.warning(f"Callback token {callback_token} not found in DynamoDB")
+            continue
+        futures.append(
+            (message_id, callback_token,
+             _EXECUTOR.submit(process_callback, callback_token, body, record))
+        )
+
+    for message_id, callback_token, future in futures:
+        try:
+            future.result()
+        except Exception as e:
+            logger.exception(f"Error processing callback {callback_token}: {e}")
+            failures.append({"itemIdentifier": message_id})
+
+    return {"batchItemFailures": failures}
+
+
 def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     """
-    Handle RunPod webhook callback.
-    
-    Expected URL: POST /webhook/{callback_token}
-    
+    Handle RunPod webhook callback(s).
+
+    Accepts either a single API Gateway event (POST /webhook/{callback_token})
+    or an SQS batch event (Records[*]) when deployed behind a fan-in queue.
+
     Expected payload from RunPod:
     {
         "id": "job-id",
@@ -108,183 +517,39 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
         "error": "..."      # Present on failure
     }
     """
-    logger.info(f"Received webhook event: {json.dumps(event)}")
-    
+    # Serializing the whole event is expensive for large payloads; only do
+    # it when debug logging is actually on.
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Received webhook event: %s", _json_dumps(event))
+
+    # SQS batch delivery: one invocation covers many callbacks, and the
+    # DynamoDB lookups collapse into BatchGetItem round-trips.
+    if "Records" in event:
+        return _handle_sqs_batch(event["Records"])
+
     try:
         # Extract callback_token from path parameters
         path_params = event.get("pathParameters", {}) or {}
         callback_token = path_params.get("callback_token")
-        
+
         if not callback_token:
             logger.error("No callback_token in path parameters")
             return {
                 "statusCode": 400,
-                "body": json.dumps({"error": "Missing callback_token in path"})
+                "body": _json_dumps({"error": "Missing callback_token in path"})
             }
-        
+
         # Parse the incoming request body
         if "body" in event:
-            body = json.loads(event["body"]) if isinstance(event["body"], str) else event["body"]
+            body = _json_loads(event["body"]) if isinstance(event["body"], str) else event["body"]
         else:
             body = event
-        
-        job_id = body.get("id", "unknown")
-        status = body.get("status", "UNKNOWN")
-        
-        logger.info(f"Processing RunPod job {job_id} with status {status} for callback {callback_token}")
-        
-        # 1. Lookup DynamoDB record
-        record = get_callback_record(callback_token)
-        
-        if not record:
-            logger.warning(f"Callback token {callback_token} not found in DynamoDB")
-            return {
-                "statusCode": 404,
-                "body": json.dumps({"error": "Callback token not found"})
-            }
-        
-        # 2. Check if already completed (idempotent)
-        if record.get("status") in ("COMPLETED", "FAILED"):
-            logger.info(f"Callback {callback_token} already {record.get('status')}, returning 200 back to RunPod")
-            return {
-                "statusCode": 200,
-                "body": json.dumps({
-                    "message": "Callback already processed",
-                    "completed_at": record.get("completed_at")
-                })
-            }
-        
-        task_token = record.get("task_token")
-        if not task_token:
-            logger.error(f"No task_token found in record for callback {callback_token}")
-            return {
-                "statusCode": 500,
-                "body": json.dumps({"error": "Missing task_token in record"})
-            }
-        
-        # 3. Process based on RunPod status
-        if status == "COMPLETED":
-            # Job succeeded - resume Step Functions with success
-            output = {
-                "job_id": job_id,
-                "status": status,
-                "callback_token": callback_token,
-                "exec_id": record.get("exec_id"),
-                "segment_filename": record.get("segment_filename"),
-                "output": body.get("output", {})
-            }
-            
-            try:
-                sfn_client.send_task_success(
-                    taskToken=task_token,
-                    output=json.dumps(output)
-                )
-                logger.info(f"Sent TaskSuccess for job {job_id}")
-                
-                # 4. Update DynamoDB with completion
-                update_callback_completed(
-                    callback_token=callback_token,
-                    status="COMPLETED",
-                    result={
-                        "job_id": job_id,
-                        "runpod_status": status,
-                        "output": body.get("output", {})
-                    }
-                )
-                
-            except sfn_client.exceptions.TaskTimedOut:
-                logger.error(f"Task token expired for callback {callback_token}")
-                # Still update DynamoDB to mark as completed
-                update_callback_completed(
-                    callback_token=callback_token,
-                    status="COMPLETED",
-                    result={"error": "Task token expired", "job_id": job_id}
-                )
-                return {
-                    "statusCode": 410,
-                    "body": json.dumps({"error": "Task token expired"})
-                }
-            except sfn_client.exceptions.InvalidToken:
-                logger.error(f"Invalid task token for callback {callback_token}")
-                update_callback_completed(
-                    callback_token=callback_token,
-                    status="FAILED",
-                    result={"error": "Invalid task token", "job_id": job_id}
-                )
-                return {
-                    "statusCode": 400,
-                    "body": json.dumps({"error": "Invalid task token"})
-                }
-            
-        elif status in ["FAILED", "CANCELLED", "TIMED_OUT"]:
-            # Job failed - resume Step Functions with failure
-            error_message = body.get("error", f"RunPod job {status}")
-            error_code = f"RunPod{status.replace('_', '')}"
-            
-            try:
-                sfn_client.send_task_failure(
-                    taskToken=task_token,
-                    error=error_code,
-                    cause=error_message
-                )
-                logger.info(f"Sent TaskFailure for job {job_id}: {error_message}")
-                
-                # 4. Update DynamoDB with failure
-                update_callback_completed(
-                    callback_token=callback_token,
-                    status="FAILED",
-                    result={
-                        "job_id": job_id,
-                        "runpod_status": status,
-                        "error": error_message
-                    }
-                )
-                
-            except sfn_client.exceptions.TaskTimedOut:
-                logger.error(f"Task token expired for callback {callback_token}")
-                update_callback_completed(
-                    callback_token=callback_token,
-                    status="FAILED",
-                    result={"error": "Task token expired", "job_id": job_id}
-                )
-                return {
-                    "statusCode": 410,
-                    "body": json.dumps({"error": "Task token expired"})
-                }
-            except sfn_client.exceptions.InvalidToken:
-                logger.error(f"Invalid task token for callback {callback_token}")
-                update_callback_completed(
-                    callback_token=callback_token,
-                    status="FAILED",
-                    result={"error": "Invalid task token", "job_id": job_id}
-                )
-                return {
-                    "statusCode": 400,
-                    "body": json.dumps({"error": "Invalid task token"})
-                }
-            
-        else:
-            # Unexpected status - log but return success (don't retry)
-            logger.warning(f"Unexpected status '{status}' for job {job_id}, ignoring")
-            return {
-                "statusCode": 200,
-                "body": json.dumps({
-                    "message": f"Ignored unexpected status: {status}"
-                })
-            }
-        
-        return {
-            "statusCode": 200,
-            "body": json.dumps({
-                "message": "Webhook processed successfully",
-                "job_id": job_id,
-                "status": status
-            })
-        }
-        
+
+        return process_callback(callback_token, body)
+
     except Exception as e:
         logger.exception(f"Error processing webhook: {e}")
         return {
             "statusCode": 500,
-            "body": json.dumps({"error": str(e)})
-        }
\ No newline at end of file
+            "body": _json_dumps({"error": str(e)})
+        }
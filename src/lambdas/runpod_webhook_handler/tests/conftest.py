@@ -10,14 +10,13 @@ os.environ["AWS_REGION"] = "us-east-1"
 
 
 # Mock boto3 at module level before index is imported anywhere
-mock_dynamodb = MagicMock()
-mock_table = MagicMock()
-mock_table.get_item = MagicMock()
-mock_table.update_item = MagicMock()
-mock_dynamodb.Table.return_value = mock_table
-
+mock_ddb_client = MagicMock()
 mock_sfn_client = MagicMock()
 
-with patch("boto3.resource", return_value=mock_dynamodb):
-    with patch("boto3.client", return_value=mock_sfn_client):
-        import index  # noqa: F401
+
+def _mock_client(service_name, **kwargs):
+    return mock_ddb_client if service_name == "dynamodb" else mock_sfn_client
+
+
+with patch("boto3.client", side_effect=_mock_client):
+    import index  # noqa: F401
@@ -9,17 +9,25 @@ from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
 import pytest
+from botocore.exceptions import ClientError
 
 import index
 
 
 @pytest.fixture
-def dynamodb_table():
-    """Mock DynamoDB table."""
-    table = MagicMock()
-    table.get_item = MagicMock()
-    table.update_item = MagicMock()
-    return table
+def ddb_client():
+    """Mock low-level DynamoDB client."""
+    client = MagicMock()
+    client.update_item = MagicMock()
+    return client
+
+
+def _conditional_check_failed(old_item=None):
+    """Build the ClientError DynamoDB raises when the claim condition fails."""
+    response = {"Error": {"Code": "ConditionalCheckFailedException"}}
+    if old_item is not None:
+        response["Item"] = old_item
+    return ClientError(response, "UpdateItem")
 
 
 @pytest.fixture
@@ -51,25 +59,25 @@ def sample_event():
 
 @pytest.fixture
 def sample_db_record():
-    """Sample DynamoDB record."""
+    """Sample DynamoDB record in low-level AttributeValue form."""
     return {
-        "callback_token": "abc123token456",
-        "task_token": "sfn-task-token-xyz",
-        "job_id": "runpod-job-789",
-        "exec_id": "exec-12345",
-        "segment_filename": "seg_0001.mp4",
-        "status": "PENDING",
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "callback_token": {"S": "abc123token456"},
+        "task_token": {"S": "sfn-task-token-xyz"},
+        "job_id": {"S": "runpod-job-789"},
+        "exec_id": {"S": "exec-12345"},
+        "segment_filename": {"S": "seg_0001.mp4"},
+        "status": {"S": "PENDING"},
+        "created_at": {"S": datetime.now(timezone.utc).isoformat()}
     }
 
 
-def test_successful_completed_webhook(dynamodb_table, sfn_client, sample_event, sample_db_record):
+def test_successful_completed_webhook(ddb_client, sfn_client, sample_event, sample_db_record):
     """Test successful processing of COMPLETED webhook."""
-    with patch("index.table", dynamodb_table), \
+    with patch("index.ddb_client", ddb_client), \
          patch("index.sfn_client", sfn_client):
         
-        # Mock DynamoDB response
-        dynamodb_table.get_item.return_value = {"Item": sample_db_record}
+        # The conditional claim returns the old item's attributes
+        ddb_client.update_item.return_value = {"Attributes": sample_db_record}
         
         # Execute handler
         response = index.lambda_handler(sample_event, None)
@@ -91,11 +99,14 @@ def test_successful_completed_webhook(dynamodb_table, sfn_client, sample_event,
         assert output["status"] == "COMPLETED"
         assert output["segment_filename"] == "seg_0001.mp4"
         
-        # Verify DynamoDB was updated
-        dynamodb_table.update_item.assert_called_once()
+        # Verify DynamoDB was updated (single conditional claim, no GetItem)
+        ddb_client.update_item.assert_called_once()
+        update_kwargs = ddb_client.update_item.call_args.kwargs
+        assert "ConditionExpression" in update_kwargs
+        assert update_kwargs["ReturnValues"] == "ALL_OLD"
 
 
-def test_successful_failed_webhook(dynamodb_table, sfn_client, sample_db_record):
+def test_successful_failed_webhook(ddb_client, sfn_client, sample_db_record):
     """Test successful processing of FAILED webhook."""
     event = {
         "pathParameters": {"callback_token": "abc123token456"},
@@ -106,10 +117,10 @@ def test_successful_failed_webhook(dynamodb_table, sfn_client, sample_db_record)
         })
     }
     
-    with patch("index.table", dynamodb_table), \
+    with patch("index.ddb_client", ddb_client), \
          patch("index.sfn_client", sfn_client):
         
-        dynamodb_table.get_item.return_value = {"Item": sample_db_record}
+        ddb_client.update_item.return_value = {"Attributes": sample_db_record}
         
         response = index.lambda_handler(event, None)
         
@@ -124,17 +135,17 @@ def test_successful_failed_webhook(dynamodb_table, sfn_client, sample_db_record)
         assert "GPU out of memory" in call_args.kwargs["cause"]
         
         # Verify DynamoDB was updated with failure
-        dynamodb_table.update_item.assert_called_once()
+        ddb_client.update_item.assert_called_once()
 
 
-def test_missing_callback_token(dynamodb_table, sfn_client):
+def test_missing_callback_token(ddb_client, sfn_client):
     """Test handling of missing callback token in path."""
     event = {
         "pathParameters": {},
         "body": json.dumps({"id": "job-123", "status": "COMPLETED"})
     }
     
-    with patch("index.table", dynamodb_table), \
+    with patch("index.ddb_client", ddb_client), \
          patch("index.sfn_client", sfn_client):
         
         response = index.lambda_handler(event, None)
@@ -146,16 +157,16 @@ def test_missing_callback_token(dynamodb_table, sfn_client):
         
         # Verify no Step Functions or DynamoDB calls
         sfn_client.send_task_success.assert_not_called()
-        dynamodb_table.get_item.assert_not_called()
+        ddb_client.update_item.assert_not_called()
 
 
-def test_callback_token_not_found(dynamodb_table, sfn_client, sample_event):
+def test_callback_token_not_found(ddb_client, sfn_client, sample_event):
     """Test handling of callback token not found in DynamoDB."""
-    with patch("index.table", dynamodb_table), \
+    with patch("index.ddb_client", ddb_client), \
          patch("index.sfn_client", sfn_client):
         
-        # Mock DynamoDB returning no item
-        dynamodb_table.get_item.return_value = {}
+        # The conditional claim fails with no old item: token never existed
+        ddb_client.update_item.side_effect = _conditional_check_failed()
         
         response = index.lambda_handler(sample_event, None)
         
@@ -168,16 +179,19 @@ def test_callback_token_not_found(dynamodb_table, sfn_client, sample_event):
         sfn_client.send_task_success.assert_not_called()
 
 
-def test_idempotent_already_processed(dynamodb_table, sfn_client, sample_event, sample_db_record):
+def test_idempotent_already_processed(ddb_client, sfn_client, sample_event, sample_db_record):
     """Test idempotent handling of already processed callback."""
-    # Mark record as already completed
-    sample_db_record["status"] = "COMPLETED"
-    sample_db_record["completed_at"] = datetime.now(timezone.utc).isoformat()
+    completed_at = datetime.now(timezone.utc).isoformat()
     
-    with patch("index.table", dynamodb_table), \
+    with patch("index.ddb_client", ddb_client), \
          patch("index.sfn_client", sfn_client):
         
-        dynamodb_table.get_item.return_value = {"Item": sample_db_record}
+        # The conditional claim fails and returns the already-final item
+        # in low-level AttributeValue form
+        ddb_client.update_item.side_effect = _conditional_check_failed({
+            "status": {"S": "COMPLETED"},
+            "completed_at": {"S": completed_at}
+        })
         
         response = index.lambda_handler(sample_event, None)
         
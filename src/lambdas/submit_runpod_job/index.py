@@ -10,34 +10,111 @@ Flow:
     Step Functions → Lambda (with task token + presigned URLs) → RunPod → Webhook → Resume Step Functions
 """
 
+import functools
 import json
 import logging
 import os
-import secrets
-from datetime import datetime, timedelta, timezone
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
-from urllib.parse import urljoin
 
 import boto3
 import requests
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson parses secrets and serializes log payloads several times
+# faster than the stdlib; fall back to stdlib json if the layer is
+# missing it.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any, default: Any = None) -> str:
+        return orjson.dumps(obj, default=default).decode("utf-8")
+else:
+    _json_loads = json.loads
+    _json_dumps = functools.partial(json.dumps, separators=(",", ":"))
 
 logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", "DEBUG"))
 
 # AWS clients
-dynamodb = boto3.resource("dynamodb")
-secretsmanager_client = boto3.client("secretsmanager")
+# Keep TCP+TLS sessions warm across invocations in the same container:
+# keep-alive stops idle sockets from being torn down during freezes, the
+# pool covers concurrent calls, and adaptive retries back off under
+# throttling instead of hammering.
+_BOTO_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=10,
+    retries={"mode": "adaptive", "max_attempts": 5},
+)
+
+# Low-level client rather than the resource API: the resource layer runs
+# every item through TypeSerializer, and the callback schema is small and
+# fixed, so hand-formed AttributeValue dicts skip that per-call overhead.
+ddb_client = boto3.client("dynamodb", config=_BOTO_CONFIG)
+secretsmanager_client = boto3.client("secretsmanager", config=_BOTO_CONFIG)
+
+# One worker each for the RunPod POST and the DynamoDB put, which have no
+# data dependency and can run concurrently.
+_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+# Reuse one HTTPS session for RunPod submissions so warm invocations skip
+# the TCP+TLS handshake, with retries on transient gateway/throttle errors.
+_runpod_session = requests.Session()
+_runpod_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=10,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 502, 503, 504),
+            # POST is not retried by default; the RunPod submit endpoint
+            # tolerates it because duplicate submissions share the webhook
+            # token and the claim on the callback record is conditional.
+            allowed_methods=("POST",),
+            respect_retry_after_header=True,
+        ),
+    ),
+)
 
 # Environment variables
 CALLBACK_TABLE_NAME = os.environ["CALLBACK_TABLE_NAME"]
 WEBHOOK_BASE_URL = os.environ["WEBHOOK_BASE_URL"]
 RUNPOD_API_KEY_SECRET_NAME = os.environ["RUNPOD_API_KEY_SECRET_NAME"]
 
-table = dynamodb.Table(CALLBACK_TABLE_NAME)
+# BatchWriteItem chunk size; DynamoDB caps it at 25, but DynamoDB-compatible
+# stores that accept larger batches can override via the environment.
+_BATCH_WRITE_SIZE = int(os.environ.get("CALLBACK_BATCH_WRITE_SIZE", "25"))
+
+# Webhook URLs are base + token; normalizing the trailing slash once at
+# import replaces urljoin's per-call URL parsing with a concatenation.
+_WEBHOOK_URL_PREFIX = (
+    WEBHOOK_BASE_URL if WEBHOOK_BASE_URL.endswith("/") else WEBHOOK_BASE_URL + "/"
+)
 
-# Cache for API key (loaded once per Lambda container)
+def _iso_now() -> str:
+    """UTC timestamp in ISO-8601 form at second resolution.
+
+    time.strftime over gmtime skips datetime/tzinfo object construction,
+    which is measurable on a path that stamps every write.
+    """
+    return time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime())
+
+
+# Cache for API key and the request headers built from it
+# (loaded once per Lambda container)
 _runpod_api_key_cache: Optional[str] = None
+_runpod_headers_cache: Optional[dict[str, str]] = None
 
 
 def get_runpod_api_key() -> str:
@@ -70,7 +147,7 @@ def get_runpod_api_key() -> str:
             secret_string = response["SecretString"]
             try:
                 # Try parsing as JSON first (e.g., {"RUNPOD_API_KEY": "value"})
-                secret_dict = json.loads(secret_string)
+                secret_dict = _json_loads(secret_string)
                 # Look for common key names
                 api_key = secret_dict.get("RUNPOD_API_KEY") or secret_dict.get("api_key") or secret_dict.get("key")
                 if not api_key:
@@ -98,6 +175,26 @@ def get_runpod_api_key() -> str:
         raise RuntimeError(f"Failed to retrieve RunPod API key: {e}")
 
 
+def get_runpod_headers() -> dict[str, str]:
+    """
+    Build the RunPod request headers once per Lambda container.
+    
+    Constructing the dict (and the Bearer string) on every submission is
+    wasted work; the API key never changes within a container.
+    
+    Returns:
+        Headers dict with Authorization and Content-Type
+    """
+    global _runpod_headers_cache
+    
+    if _runpod_headers_cache is None:
+        _runpod_headers_cache = {
+            "Authorization": f"Bearer {get_runpod_api_key()}",
+            "Content-Type": "application/json"
+        }
+    return _runpod_headers_cache
+
+
 def generate_callback_token() -> str:
     """
     Generate a secure random callback token.
@@ -105,7 +202,9 @@ def generate_callback_token() -> str:
     Returns:
         64-character hex string (32 bytes)
     """
-    return secrets.token_hex(32)
+    # os.urandom is the same CSPRNG the secrets module wraps, minus the
+    # module indirection (and its import at cold start).
+    return os.urandom(32).hex()
 
 
 def submit_runpod_job(
@@ -139,17 +238,14 @@ def submit_runpod_job(
         "webhookV2": webhook_url
     }
     
-    headers = {
-        "Authorization": f"Bearer {get_runpod_api_key()}",
-        "Content-Type": "application/json"
-    }
-    
     try:
-        response = requests.post(
+        response = _runpod_session.post(
             rundpod_endpoint_url,
             json=payload,
-            headers=headers,
-            timeout=30
+            headers=get_runpod_headers(),
+            # (connect, read): fail a dead connection fast so the retries
+            # above fit inside the Step Functions task timeout.
+            timeout=(5, 15)
         )
         response.raise_for_status()
         
@@ -174,46 +270,238 @@ def store_callback_mapping(
     task_token: str,
     exec_id: str,
     segment_filename: str,
-    job_id: str,
     ttl_hours: int = 168  # 7 days
 ) -> None:
     """
     Store callback token mapping in DynamoDB.
     
+    The record is written before RunPod assigns a job ID so the webhook
+    handler can never observe a callback token it has no record for; the
+    job ID is patched in afterwards via record_job_id.
+    
     Args:
         callback_token: Unique callback identifier
         task_token: Step Functions task token
         exec_id: Execution ID
         segment_filename: Segment filename
-        job_id: RunPod job ID
         ttl_hours: TTL in hours (default 7 days)
     """
-    logger.info(f"Storing callback mapping: token={callback_token}, job={job_id}")
-    
-    now = datetime.now(timezone.utc)
-    expires_at = now + timedelta(hours=ttl_hours)
+    logger.info(f"Storing callback mapping: token={callback_token}")
     
     try:
-        table.put_item(
-            Item={
-                "callback_token": callback_token,
-                "task_token": task_token,
-                "job_id": job_id,
-                "exec_id": exec_id,
-                "segment_filename": segment_filename,
-                "status": "PENDING",
-                "created_at": now.isoformat(),
-                "expires_at": expires_at.isoformat(),
-                "ttl": int(expires_at.timestamp())  # For DynamoDB TTL
-            }
+        ddb_client.put_item(
+            TableName=CALLBACK_TABLE_NAME,
+            Item=_callback_item(callback_token, task_token, exec_id,
+                                segment_filename, ttl_hours),
+            # Create-only write: a token collision (~2^-256, but previously
+            # a silent overwrite) now fails loudly, and declaring the put
+            # as a create spares DynamoDB any read-before-write merging.
+            ConditionExpression="attribute_not_exists(callback_token)"
         )
         logger.info(f"Callback mapping stored successfully")
         
     except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+            # The webhook URL with this token is already in flight to
+            # RunPod, so a silent token swap here would strand the job;
+            # fail the invocation and let Step Functions retry with a
+            # fresh token.
+            logger.error(f"Callback token collision for {callback_token}")
         logger.error(f"Error storing callback mapping: {e}")
         raise
 
 
+def _callback_item(
+    callback_token: str,
+    task_token: str,
+    exec_id: str,
+    segment_filename: str,
+    ttl_hours: int = 168  # 7 days
+) -> dict[str, Any]:
+    """Build the AttributeValue-form callback record for a pending job."""
+    return {
+        "callback_token": {"S": callback_token},
+        "task_token": {"S": task_token},
+        "exec_id": {"S": exec_id},
+        "segment_filename": {"S": segment_filename},
+        "status": {"S": "PENDING"},
+        "created_at": {"S": _iso_now()},
+        # The epoch ttl is all DynamoDB TTL needs; a human-readable
+        # expires_at would only pad every item by ~40 bytes.
+        "ttl": {"N": str(int(time.time()) + ttl_hours * 3600)}
+    }
+
+
+def store_callback_mappings_batch(items: list[dict[str, Any]]) -> None:
+    """
+    Write many callback records with BatchWriteItem.
+    
+    One round-trip per chunk replaces one PutItem per segment when jobs
+    fan out. BatchWriteItem puts cannot carry the single-path create-only
+    condition, which is acceptable here: every token in the batch was
+    generated in this invocation. Unprocessed items are retried with
+    capped exponential backoff, as DynamoDB may partially accept a batch
+    under throttling.
+    
+    Args:
+        items: AttributeValue-form callback records (see _callback_item)
+    """
+    put_requests = [{"PutRequest": {"Item": item}} for item in items]
+    for start in range(0, len(put_requests), _BATCH_WRITE_SIZE):
+        request_items = {
+            CALLBACK_TABLE_NAME: put_requests[start:start + _BATCH_WRITE_SIZE]
+        }
+        backoff = 0.05
+        while request_items:
+            try:
+                response = ddb_client.batch_write_item(RequestItems=request_items)
+            except ClientError as e:
+                logger.error(f"Error batch-writing callback records: {e}")
+                raise
+            request_items = response.get("UnprocessedItems") or None
+            if request_items:
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 1.0)
+
+
+def record_job_id(callback_token: str, job_id: str) -> None:
+    """
+    Attach the RunPod job ID to an already-stored callback record.
+    
+    Args:
+        callback_token: Unique callback identifier
+        job_id: RunPod job ID
+    """
+    try:
+        ddb_client.update_item(
+            TableName=CALLBACK_TABLE_NAME,
+            Key={"callback_token": {"S": callback_token}},
+            UpdateExpression="SET job_id = :job_id",
+            ExpressionAttributeValues={":job_id": {"S": job_id}}
+        )
+    except ClientError as e:
+        logger.error(f"Error recording job ID: {e}")
+        raise
+
+
+# Flat upscale parameters forwarded verbatim from the event to RunPod.
+_PARAM_KEYS = (
+    "log_level", "debug", "seed", "color_correction", "model", "resolution",
+    "batch_size_strategy", "batch_size_explicit", "batch_size_conservative",
+    "batch_size_quality", "chunk_size_strategy", "chunk_size_explicit",
+    "chunk_size_recommended", "chunk_size_fallback", "attention_mode",
+    "temporal_overlap", "vae_encode_tiled", "vae_decode_tiled", "cache_dit",
+    "cache_vae", "compile_dit", "compile_vae", "video_backend", "ten_bit",
+)
+
+
+def _extract_required_fields(event: dict[str, Any]) -> tuple[str, str, str, str, str, str]:
+    """Validate one submission event; returns the required fields.
+    
+    Raises:
+        ValueError: If any required field is missing
+    """
+    task_token = event.get("task_token")
+    if not task_token:
+        raise ValueError("Missing required field: task_token")
+    
+    exec_id = event.get("exec_id")
+    if not exec_id:
+        raise ValueError("Missing required field: exec_id")
+    
+    segment = event.get("segment", {})
+    segment_filename = segment.get("filename")
+    if not segment_filename:
+        raise ValueError("Missing required field: segment.filename")
+    
+    input_presigned_url = event.get("input_presigned_url")
+    output_presigned_url = event.get("output_presigned_url")
+    
+    if not input_presigned_url or not output_presigned_url:
+        raise ValueError("Missing required fields: input_presigned_url, output_presigned_url")
+    
+    runpod_endpoint_url = event.get("runpod_endpoint")
+    if not runpod_endpoint_url:
+        raise ValueError("Missing required field: runpod_endpoint")
+    
+    return (task_token, exec_id, segment_filename,
+            input_presigned_url, output_presigned_url, runpod_endpoint_url)
+
+
+def _build_params(event: dict[str, Any]) -> dict[str, Any]:
+    """Build the RunPod params dict from the flat upscale parameters."""
+    return {key: event.get(key) for key in _PARAM_KEYS}
+
+
+def lambda_handler_batch(event: dict[str, Any], context: Any) -> list[dict[str, Any]]:
+    """
+    Submit RunPod jobs for a whole list of segments in one invocation.
+    
+    Expected input: {"segments": [<payloads with the shape lambda_handler
+    accepts>]}. All callback records land up front in BatchWriteItem
+    chunks (one round-trip per 25 segments instead of one PutItem each,
+    and before any webhook URL is in flight), the RunPod submissions then
+    run concurrently, and each record finally gets its job_id patched in.
+    The single-segment entry point is unchanged.
+    
+    Returns:
+        One response dict per segment, in input order
+    """
+    segments = event.get("segments")
+    if not segments:
+        raise ValueError("Missing required field: segments")
+    
+    prepared = []
+    for seg_event in segments:
+        (task_token, exec_id, segment_filename,
+         input_url, output_url, endpoint) = _extract_required_fields(seg_event)
+        callback_token = generate_callback_token()
+        prepared.append({
+            "callback_token": callback_token,
+            "task_token": task_token,
+            "exec_id": exec_id,
+            "segment_filename": segment_filename,
+            "input_url": input_url,
+            "output_url": output_url,
+            "endpoint": endpoint,
+            "params": _build_params(seg_event),
+            "webhook_url": _WEBHOOK_URL_PREFIX + callback_token,
+        })
+    
+    store_callback_mappings_batch([
+        _callback_item(p["callback_token"], p["task_token"],
+                       p["exec_id"], p["segment_filename"])
+        for p in prepared
+    ])
+    
+    def _submit(p: dict[str, Any]) -> str:
+        return submit_runpod_job(
+            input_url=p["input_url"],
+            output_url=p["output_url"],
+            webhook_url=p["webhook_url"],
+            rundpod_endpoint_url=p["endpoint"],
+            params=p["params"]
+        )
+    
+    with ThreadPoolExecutor(max_workers=min(8, len(prepared))) as pool:
+        job_ids = list(pool.map(_submit, prepared))
+        list(pool.map(
+            lambda pair: record_job_id(pair[0]["callback_token"], pair[1]),
+            zip(prepared, job_ids)
+        ))
+    
+    return [
+        {
+            "callback_token": p["callback_token"],
+            "job_id": job_id,
+            "webhook_url": p["webhook_url"],
+            "segment_filename": p["segment_filename"],
+            "exec_id": p["exec_id"]
+        }
+        for p, job_id in zip(prepared, job_ids)
+    ]
+
+
 def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     """
     Lambda handler for submitting RunPod jobs with webhook callbacks.
@@ -263,71 +551,40 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
         "webhook_url": "https://api.../webhook/abc123"
     }
     """
-    logger.info(f"Received event: {json.dumps(event, default=str)}")
+    # Serializing the whole event is expensive for large payloads; only do
+    # it when debug logging is actually on.
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Received event: %s", _json_dumps(event, default=str))
     
     try:
         # Extract required fields
-        task_token = event.get("task_token")
-        if not task_token:
-            raise ValueError("Missing required field: task_token")
-        
-        exec_id = event.get("exec_id")
-        if not exec_id:
-            raise ValueError("Missing required field: exec_id")
-        
-        segment = event.get("segment", {})
-        segment_filename = segment.get("filename")
-        if not segment_filename:
-            raise ValueError("Missing required field: segment.filename")
-        
-        input_presigned_url = event.get("input_presigned_url")
-        output_presigned_url = event.get("output_presigned_url")
-        
-        if not input_presigned_url or not output_presigned_url:
-            raise ValueError("Missing required fields: input_presigned_url, output_presigned_url")
-        
-        runpod_endpoint_url = event.get("runpod_endpoint")
-        if not runpod_endpoint_url:
-            raise ValueError("Missing required field: runpod_endpoint")
+        (task_token, exec_id, segment_filename,
+         input_presigned_url, output_presigned_url,
+         runpod_endpoint_url) = _extract_required_fields(event)
         
         # Build params dict from flat upscale parameters
-        params = {
-            "log_level": event.get("log_level"),
-            "debug": event.get("debug"),
-            "seed": event.get("seed"),
-            "color_correction": event.get("color_correction"),
-            "model": event.get("model"),
-            "resolution": event.get("resolution"),
-            "batch_size_strategy": event.get("batch_size_strategy"),
-            "batch_size_explicit": event.get("batch_size_explicit"),
-            "batch_size_conservative": event.get("batch_size_conservative"),
-            "batch_size_quality": event.get("batch_size_quality"),
-            "chunk_size_strategy": event.get("chunk_size_strategy"),
-            "chunk_size_explicit": event.get("chunk_size_explicit"),
-            "chunk_size_recommended": event.get("chunk_size_recommended"),
-            "chunk_size_fallback": event.get("chunk_size_fallback"),
-            "attention_mode": event.get("attention_mode"),
-            "temporal_overlap": event.get("temporal_overlap"),
-            "vae_encode_tiled": event.get("vae_encode_tiled"),
-            "vae_decode_tiled": event.get("vae_decode_tiled"),
-            "cache_dit": event.get("cache_dit"),
-            "cache_vae": event.get("cache_vae"),
-            "compile_dit": event.get("compile_dit"),
-            "compile_vae": event.get("compile_vae"),
-            "video_backend": event.get("video_backend"),
-            "ten_bit": event.get("ten_bit")
-        }
+        params = _build_params(event)
         
         # 1. Generate callback token
         callback_token = generate_callback_token()
         logger.info(f"Generated callback token: {callback_token}")
         
         # 2. Build webhook URL
-        webhook_url = urljoin(WEBHOOK_BASE_URL, callback_token)
+        webhook_url = _WEBHOOK_URL_PREFIX + callback_token
         logger.info(f"Webhook URL: {webhook_url}")
         
-        # 3. Submit to RunPod
-        job_id = submit_runpod_job(
+        # 3. Store the callback mapping and submit to RunPod concurrently.
+        # Writing the record up front (without the job ID) also closes the
+        # race where RunPod fires the webhook before the record exists.
+        store_future = _EXECUTOR.submit(
+            store_callback_mapping,
+            callback_token=callback_token,
+            task_token=task_token,
+            exec_id=exec_id,
+            segment_filename=segment_filename
+        )
+        submit_future = _EXECUTOR.submit(
+            submit_runpod_job,
             input_url=input_presigned_url,
             output_url=output_presigned_url,
             webhook_url=webhook_url,
@@ -335,14 +592,11 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
             params=params
         )
         
-        # 4. Store callback mapping in DynamoDB
-        store_callback_mapping(
-            callback_token=callback_token,
-            task_token=task_token,
-            exec_id=exec_id,
-            segment_filename=segment_filename,
-            job_id=job_id
-        )
+        store_future.result()
+        job_id = submit_future.result()
+        
+        # 4. Patch the job ID into the stored record
+        record_job_id(callback_token, job_id)
         
         # 5. Return quickly
         response = {
@@ -353,9 +607,25 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
             "exec_id": exec_id
         }
         
-        logger.info(f"Job submitted successfully: {json.dumps(response)}")
+        logger.info(f"Job submitted successfully: {_json_dumps(response)}")
         return response
         
     except Exception as e:
         logger.exception(f"Error submitting RunPod job: {e}")
         raise
+
+
+# Prime connections and caches during the init phase, which gets boosted
+# CPU and is free under provisioned concurrency: describe_table performs the
+# DynamoDB DNS + TCP + TLS setup, and fetching the API key up front warms
+# both the Secrets Manager pool and the in-process key cache. Best-effort
+# only - a failure here defers to the first invocation rather than breaking
+# the cold start.
+try:
+    ddb_client.describe_table(TableName=CALLBACK_TABLE_NAME)
+except Exception:
+    pass
+try:
+    get_runpod_api_key()
+except Exception:
+    pass
@@ -14,22 +14,24 @@ os.environ["AWS_REGION"] = "us-east-1"
 
 
 # Mock boto3 at module level before index is imported anywhere
-mock_dynamodb = MagicMock()
-mock_table = MagicMock()
-mock_table.put_item = MagicMock()
-mock_dynamodb.Table.return_value = mock_table
-
+mock_ddb_client = MagicMock()
 mock_secrets_client = MagicMock()
 
-with patch("boto3.resource", return_value=mock_dynamodb):
-    with patch("boto3.client", return_value=mock_secrets_client):
-        import index  # noqa: F401
+
+def _mock_client(service_name, **kwargs):
+    return mock_ddb_client if service_name == "dynamodb" else mock_secrets_client
+
+
+with patch("boto3.client", side_effect=_mock_client):
+    import index  # noqa: F401
 
 
 @pytest.fixture
 def reset_cache():
-    """Reset API key cache between tests."""
+    """Reset API key and header caches between tests."""
     import index
     index._runpod_api_key_cache = None
+    index._runpod_headers_cache = None
     yield
     index._runpod_api_key_cache = None
+    index._runpod_headers_cache = None
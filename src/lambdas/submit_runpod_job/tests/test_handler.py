@@ -4,6 +4,7 @@ Unit tests for Submit RunPod Job Lambda.
 Tests job submission logic, RunPod API integration, and DynamoDB callback storage.
 """
 
+import copy
 import json
 from unittest.mock import MagicMock, patch
 
@@ -12,13 +13,16 @@ from botocore.exceptions import ClientError
 
 import index
 
+# Precomputed secret payload shared by every test; no per-test json.dumps
+_SECRET_STRING = '{"RUNPOD_API_KEY": "test-api-key-123"}'
+
 
 @pytest.fixture
-def dynamodb_table():
-    """Mock DynamoDB table."""
-    table = MagicMock()
-    table.put_item = MagicMock()
-    return table
+def ddb_client():
+    """Mock low-level DynamoDB client."""
+    client = MagicMock()
+    client.put_item = MagicMock()
+    return client
 
 
 @pytest.fixture
@@ -26,14 +30,14 @@ def secrets_client():
     """Mock Secrets Manager client."""
     client = MagicMock()
     client.get_secret_value = MagicMock(return_value={
-        "SecretString": json.dumps({"RUNPOD_API_KEY": "test-api-key-123"})
+        "SecretString": _SECRET_STRING
     })
     return client
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_event():
-    """Sample event from Step Functions."""
+    """Sample event from Step Functions (session-scoped; deepcopy to mutate)."""
     return {
         "exec_id": "exec-12345",
         "task_token": "sfn-task-token-xyz-abc",
@@ -74,20 +78,20 @@ def sample_event():
 
 @pytest.fixture
 def mock_requests():
-    """Mock requests library."""
-    mock_req = MagicMock()
+    """Mock the shared RunPod HTTP session."""
+    mock_session = MagicMock()
     mock_response = MagicMock()
     mock_response.json.return_value = {"id": "runpod-job-abc123"}
     mock_response.raise_for_status = MagicMock()
-    mock_req.post.return_value = mock_response
+    mock_session.post.return_value = mock_response
     
-    with patch("index.requests", mock_req):
-        yield mock_req
+    with patch("index._runpod_session", mock_session):
+        yield mock_session
 
 
-def test_successful_job_submission(dynamodb_table, secrets_client, mock_requests, sample_event, reset_cache):
+def test_successful_job_submission(ddb_client, secrets_client, mock_requests, sample_event, reset_cache):
     """Test successful RunPod job submission."""
-    with patch("index.table", dynamodb_table), \
+    with patch("index.ddb_client", ddb_client), \
          patch("index.secretsmanager_client", secrets_client), \
          patch("index._runpod_api_key_cache", "test-api-key-123"):
         
@@ -113,64 +117,72 @@ def test_successful_job_submission(dynamodb_table, secrets_client, mock_requests
         headers = call_args.kwargs["headers"]
         assert headers["Authorization"] == "Bearer test-api-key-123"
         
-        # Verify DynamoDB was called
-        dynamodb_table.put_item.assert_called_once()
-        db_item = dynamodb_table.put_item.call_args.kwargs["Item"]
-        assert db_item["task_token"] == "sfn-task-token-xyz-abc"
-        assert db_item["job_id"] == "runpod-job-abc123"
-        assert db_item["status"] == "PENDING"
+        # Verify DynamoDB was called: the record is written before the job
+        # ID exists, then the job ID is patched in with an update
+        ddb_client.put_item.assert_called_once()
+        db_item = ddb_client.put_item.call_args.kwargs["Item"]
+        assert db_item["task_token"] == {"S": "sfn-task-token-xyz-abc"}
+        assert "job_id" not in db_item
+        assert db_item["status"] == {"S": "PENDING"}
+        
+        ddb_client.update_item.assert_called_once()
+        update_kwargs = ddb_client.update_item.call_args.kwargs
+        assert update_kwargs["Key"] == {"callback_token": {"S": response["callback_token"]}}
+        assert update_kwargs["ExpressionAttributeValues"][":job_id"] == {"S": "runpod-job-abc123"}
 
 
-def test_missing_task_token(dynamodb_table, secrets_client, sample_event, reset_cache):
+def test_missing_task_token(ddb_client, secrets_client, sample_event, reset_cache):
     """Test error handling when task_token is missing."""
-    # Remove task_token from event
-    del sample_event["task_token"]
+    # Remove task_token from a private copy of the shared event
+    event = copy.deepcopy(sample_event)
+    del event["task_token"]
     
-    with patch("index.table", dynamodb_table), \
+    with patch("index.ddb_client", ddb_client), \
          patch("index.secretsmanager_client", secrets_client):
         
         with pytest.raises(ValueError, match="Missing required field: task_token"):
-            index.lambda_handler(sample_event, None)
+            index.lambda_handler(event, None)
 
 
-def test_missing_segment_filename(dynamodb_table, secrets_client, sample_event, reset_cache):
+def test_missing_segment_filename(ddb_client, secrets_client, sample_event, reset_cache):
     """Test error handling when segment filename is missing."""
-    # Remove filename from segment
-    del sample_event["segment"]["filename"]
+    # Remove filename from a private copy of the shared event
+    event = copy.deepcopy(sample_event)
+    del event["segment"]["filename"]
     
-    with patch("index.table", dynamodb_table), \
+    with patch("index.ddb_client", ddb_client), \
          patch("index.secretsmanager_client", secrets_client):
         
         with pytest.raises(ValueError, match="Missing required field: segment.filename"):
-            index.lambda_handler(sample_event, None)
+            index.lambda_handler(event, None)
 
 
-def test_runpod_api_error(dynamodb_table, secrets_client, sample_event, reset_cache):
+def test_runpod_api_error(ddb_client, secrets_client, sample_event, reset_cache):
     """Test error handling when RunPod API returns an error."""
-    with patch("index.table", dynamodb_table), \
+    with patch("index.ddb_client", ddb_client), \
          patch("index.secretsmanager_client", secrets_client), \
          patch("index._runpod_api_key_cache", "test-api-key-123"):
         
-        # Patch index.requests
-        mock_req = MagicMock()
+        # Patch the shared session
+        mock_session = MagicMock()
         mock_response = MagicMock()
         mock_response.raise_for_status.side_effect = Exception("API Error: 500")
         mock_response.text = "Internal Server Error"
-        mock_req.post.return_value = mock_response
+        mock_session.post.return_value = mock_response
         
-        with patch("index.requests", mock_req):
+        with patch("index._runpod_session", mock_session):
             with pytest.raises(Exception):
                 index.lambda_handler(sample_event, None)
 
 
-def test_dynamodb_error(dynamodb_table, secrets_client, mock_requests, sample_event, reset_cache):
+def test_dynamodb_error(ddb_client, secrets_client, mock_requests, sample_event, reset_cache):
     """Test error handling when DynamoDB fails to store callback."""
-    with patch("index.table", dynamodb_table), \
+    with patch("index.ddb_client", ddb_client), \
          patch("index.secretsmanager_client", secrets_client), \
          patch("index._runpod_api_key_cache", "test-api-key-123"):
         
         # Mock DynamoDB error
-        dynamodb_table.put_item.side_effect = ClientError(
+        ddb_client.put_item.side_effect = ClientError(
             {"Error": {"Code": "ServiceUnavailable"}},
             "PutItem"
         )
@@ -178,3 +190,35 @@ def test_dynamodb_error(dynamodb_table, secrets_client, mock_requests, sample_ev
         with pytest.raises(ClientError):
             index.lambda_handler(sample_event, None)
 
+
+def test_batch_job_submission(ddb_client, secrets_client, mock_requests, sample_event, reset_cache):
+    """Test the batched entry point coalesces the callback writes."""
+    second_event = json.loads(json.dumps(sample_event))
+    second_event["segment"]["filename"] = "seg_0001.mp4"
+    
+    with patch("index.ddb_client", ddb_client), \
+         patch("index.secretsmanager_client", secrets_client), \
+         patch("index._runpod_api_key_cache", "test-api-key-123"):
+        
+        ddb_client.batch_write_item.return_value = {"UnprocessedItems": {}}
+        
+        responses = index.lambda_handler_batch(
+            {"segments": [sample_event, second_event]}, None
+        )
+        
+        assert len(responses) == 2
+        assert responses[0]["segment_filename"] == "seg_0000.mp4"
+        assert responses[1]["segment_filename"] == "seg_0001.mp4"
+        assert all(r["job_id"] == "runpod-job-abc123" for r in responses)
+        
+        # Two segments become one BatchWriteItem call with two puts
+        ddb_client.batch_write_item.assert_called_once()
+        request_items = ddb_client.batch_write_item.call_args.kwargs["RequestItems"]
+        puts = request_items["test-callback-table"]
+        assert len(puts) == 2
+        assert all("job_id" not in put["PutRequest"]["Item"] for put in puts)
+        
+        # One RunPod submission and one job_id update per segment
+        assert mock_requests.post.call_count == 2
+        assert ddb_client.update_item.call_count == 2
+        ddb_client.put_item.assert_not_called()
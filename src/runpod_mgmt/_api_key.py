@@ -0,0 +1,19 @@
+"""
+Cached RUNPOD_API_KEY lookup.
+
+When these modules are driven in a loop from the pipeline rather than
+once per CLI process, re-reading the environment on every call adds up;
+lru_cache memoizes the first read. Tests can invalidate with
+``api_key.cache_clear()``.
+"""
+
+import functools
+import os
+
+
+@functools.lru_cache(maxsize=1)
+def api_key() -> str:
+    value = os.environ.get("RUNPOD_API_KEY")
+    if not value:
+        raise ValueError("RUNPOD_API_KEY environment variable is required")
+    return value
@@ -0,0 +1,71 @@
+"""Persistent on-disk cache for RunPod control-plane reads.
+
+CLI invocations each start a fresh process, so the in-memory TTL caches
+never help across reruns; CI pipelines re-running these scripts pay the
+full listing round-trip every time. When diskcache is installed,
+successful GET payloads are persisted under ~/.cache/runpod_mgmt
+(RUNPOD_MGMT_CACHE_DIR override) keyed by a hash of URL + api key, with
+the same short TTL. Without diskcache every call is a miss.
+"""
+import hashlib
+import logging
+import os
+import time
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+TTL = float(os.environ.get("RUNPOD_MGMT_DISK_CACHE_TTL", "30"))
+
+try:
+    import diskcache
+
+    _CACHE = diskcache.Cache(
+        os.path.expanduser(
+            os.environ.get("RUNPOD_MGMT_CACHE_DIR", "~/.cache/runpod_mgmt")
+        )
+    )
+except Exception:
+    # diskcache missing or the cache dir unusable; run without persistence
+    _CACHE = None
+
+
+def _key(url: str, api_key: str) -> str:
+    return hashlib.sha256(f"{url}|{api_key}".encode()).hexdigest()
+
+
+def get(url: str, api_key: str, ttl: float = TTL) -> Optional[Any]:
+    """Return the cached payload for url, or None on miss/expiry."""
+    if _CACHE is None:
+        return None
+    try:
+        entry = _CACHE.get(_key(url, api_key))
+    except Exception as e:
+        logger.debug("Disk cache read failed: %s", e)
+        return None
+    if entry is None:
+        return None
+    stored_ts, payload = entry
+    if time.time() - stored_ts >= ttl:
+        return None
+    return payload
+
+
+def put(url: str, api_key: str, payload: Any) -> None:
+    """Persist a successful response payload for url."""
+    if _CACHE is None:
+        return
+    try:
+        _CACHE.set(_key(url, api_key), (time.time(), payload))
+    except Exception as e:
+        logger.debug("Disk cache write failed: %s", e)
+
+
+def clear() -> None:
+    """Drop everything; called when a write makes cached reads stale."""
+    if _CACHE is None:
+        return
+    try:
+        _CACHE.clear()
+    except Exception as e:
+        logger.debug("Disk cache clear failed: %s", e)
@@ -0,0 +1,27 @@
+"""Shared GitHub Actions output helper.
+
+Collects ``key=value`` lines in memory and writes them to the file named
+by ``GITHUB_OUTPUT`` (or ``/dev/stdout`` outside Actions) in a single
+append at process exit, so a run that emits many outputs pays one
+open/write/close instead of one per field.
+"""
+import atexit
+import os
+
+_buffer = []
+
+
+def _flush() -> None:
+    if not _buffer:
+        return
+    with open(os.environ.get("GITHUB_OUTPUT", "/dev/stdout"), "a") as out:
+        out.write("".join(_buffer))
+    _buffer.clear()
+
+
+atexit.register(_flush)
+
+
+def emit_output(key: str, value) -> None:
+    """Queue a single ``key=value`` line; flushed in one write at exit."""
+    _buffer.append(f"{key}={value}\n")
@@ -0,0 +1,36 @@
+"""
+Shared HTTP session for RunPod REST API calls.
+
+Every module in this package talks to rest.runpod.io; a single pooled
+requests.Session per process lets a burst of control-plane calls
+(exists-check -> update -> output) reuse one TCP+TLS connection instead
+of paying the handshake on every request.
+"""
+
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Normalize the REST base URL once at import: default it when unset and
+# strip a trailing slash so f-strings never build double-slash URLs that
+# some proxies answer with a redirect.
+_raw_base = os.environ.get("RUNPOD_REST_API_BASE_URL")
+if _raw_base == "":
+    raise RuntimeError("RUNPOD_REST_API_BASE_URL is set but empty")
+BASE_URL = (_raw_base or "https://rest.runpod.io/v1").rstrip("/")
+
+# Retry transient failures with exponential backoff, but only for
+# idempotent methods; POSTs (creates) are never replayed. Retry-After is
+# honoured so rate-limited bursts degrade gracefully.
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset(["HEAD", "GET", "PATCH"]),
+    respect_retry_after_header=True,
+)
+
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=_RETRY))
@@ -0,0 +1,39 @@
+"""Shared GPU/data-center ID normalization.
+
+create_endpoint and update_endpoint carried near-identical helpers that
+re-split and re-stripped the same handful of strings on every call (the
+create path ran both, twice). One function serves both shapes, and the
+string path is memoized since CI uses a tiny fixed set of values.
+"""
+import functools
+from typing import Any, Optional
+
+
+@functools.lru_cache(maxsize=64)
+def _split(ids: str) -> tuple:
+    return tuple(item.strip() for item in ids.split(",") if item.strip())
+
+
+def normalize_ids(ids: Optional[Any], as_list: bool = False):
+    """
+    Normalize an ID spec (string, comma-separated string, or list).
+
+    Args:
+        ids: Raw IDs as a string, list, or other scalar; None passes through
+        as_list: Return a list of IDs (REST payload shape) instead of a
+            comma-joined string (SDK shape)
+
+    Returns:
+        list or str: Normalized IDs, or None when nothing remains
+    """
+    if ids is None:
+        return None
+    if isinstance(ids, str):
+        parts = _split(ids)
+    elif isinstance(ids, list):
+        parts = tuple(str(item).strip() for item in ids if str(item).strip())
+    else:
+        parts = (str(ids).strip(),)
+    if not parts:
+        return None
+    return list(parts) if as_list else ",".join(parts)
@@ -0,0 +1,22 @@
+"""JSON helpers backed by orjson, with a stdlib fallback.
+
+orjson parses the large endpoint/volume listings several times faster
+than the stdlib and emits compact bytes without a separators tuple;
+when it's not installed the stdlib versions keep everything working.
+"""
+import json
+
+try:
+    import orjson
+
+    def loads(data):
+        return orjson.loads(data)
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def loads(data):
+        return json.loads(data)
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
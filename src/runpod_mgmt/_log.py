@@ -0,0 +1,18 @@
+"""Shared logging setup for the runpod_mgmt CLI entry points.
+
+Modules in this package used to call logging.basicConfig at import, so
+importing them as a library configured the root logger as a side effect
+and repeated the format-string parse per module. Entry points call
+configure() instead; library imports pay no setup cost.
+"""
+import logging
+import os
+
+
+def configure() -> None:
+    """Configure the root logger once; no-op if handlers already exist."""
+    if not logging.getLogger().handlers:
+        logging.basicConfig(
+            level=os.environ.get("LOG_LEVEL", "INFO"),
+            format='%(asctime)s - %(levelname)s - %(message)s'
+        )
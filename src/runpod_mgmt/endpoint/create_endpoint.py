@@ -5,27 +5,50 @@ This script creates a new endpoint or updates an existing one to use a new templ
 """
 
 import os
-import sys
-import argparse
 import logging
+from .. import _cache, _gh_output, _log
+from .._ids import normalize_ids
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Any
-import runpod
-from .find_endpoint_by_name import find_endpoint_by_name
+from .._http import BASE_URL, SESSION
+from ..network_volume.find_network_volume_by_id import find_network_volume_by_id
+from .find_endpoint_by_id import find_endpoint_by_id
+from .find_endpoint_by_name import find_endpoint_by_name, invalidate_cache
 from .update_endpoint import update_endpoint
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def _normalize_ids_for_sdk(ids: Optional[Any]) -> Optional[str]:
-    if ids is None:
-        return None
-    if isinstance(ids, list):
-        parts = [str(item).strip() for item in ids if str(item).strip()]
-        return ",".join(parts) if parts else None
-    if isinstance(ids, str):
-        parts = [item.strip() for item in ids.split(",") if item.strip()]
-        return ",".join(parts) if parts else None
-    return str(ids).strip()
+# The name->id mapping is stable across runs, so it lives far longer than
+# the listing caches; a stale entry just costs one 404 before the
+# listing fallback.
+_NAME_MAP_TTL = float(os.environ.get("RUNPOD_ENDPOINT_NAME_MAP_TTL", "86400"))
+
+def _create_endpoint_rest(payload: dict, api_key: str) -> dict:
+    """
+    Create an endpoint with a single REST POST.
+    
+    Unlike the SDK's create_endpoint, the REST endpoint accepts
+    executionTimeoutMs and networkVolumeId directly, so no follow-up
+    PATCH is needed.
+    """
+    url = f"{BASE_URL}/endpoints"
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+    response = SESSION.post(url, json=payload, headers=headers, timeout=30)
+    response.raise_for_status()
+    return response.json()
+
+
+def _find_existing_endpoint(name: str, api_key: str) -> Optional[dict]:
+    """Resolve an endpoint by name, via the persisted name->id fast path."""
+    mapped_id = _cache.get(f"name-map://endpoints/{name}", api_key, ttl=_NAME_MAP_TTL)
+    if mapped_id:
+        endpoint = find_endpoint_by_id(mapped_id, api_key)
+        if endpoint:
+            return endpoint
+    return find_endpoint_by_name(name, api_key)
 
 
 def create_or_update_endpoint(
@@ -66,9 +89,30 @@ def create_or_update_endpoint(
     if not api_key:
         raise ValueError("RUNPOD_API_KEY environment variable is required")
     
-    runpod.api_key = api_key
-    normalized_gpu_ids = _normalize_ids_for_sdk(gpu_ids)
-    normalized_data_center_ids = _normalize_ids_for_sdk(data_center_ids)
+    normalized_gpu_ids = normalize_ids(gpu_ids)
+    normalized_data_center_ids = normalize_ids(data_center_ids)
+    
+    # Validate the network volume while the endpoint lookup runs; the two
+    # independent HTTPS calls cost ~max(t1, t2) instead of t1 + t2, and a
+    # bad volume ID fails here instead of after a wasted create.
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        volume_future = None
+        if network_volume_id:
+            volume_future = pool.submit(
+                find_network_volume_by_id, network_volume_id, api_key
+            )
+        
+        endpoint_future = None
+        if not endpoint_id:
+            endpoint_future = pool.submit(_find_existing_endpoint, name, api_key)
+        
+        if volume_future is not None and volume_future.result() is None:
+            raise ValueError(
+                f"Network volume {network_volume_id} not found; "
+                "refusing to create/update the endpoint with a bad volume ID"
+            )
+        
+        existing_endpoint = endpoint_future.result() if endpoint_future else None
     
     # Check if we should update an existing endpoint
     if endpoint_id:
@@ -89,11 +133,9 @@ def create_or_update_endpoint(
             network_volume_id=network_volume_id
         )
     
-    # Search for existing endpoint by name
-    existing_endpoint = find_endpoint_by_name(name, api_key)
-    
     if existing_endpoint:
         endpoint_id = existing_endpoint.get("id")
+        _cache.put(f"name-map://endpoints/{name}", api_key, endpoint_id)
         logger.info(f"Found existing endpoint '{name}' with ID: {endpoint_id}")
         logger.info("Updating endpoint with new template...")
         
@@ -113,46 +155,40 @@ def create_or_update_endpoint(
             network_volume_id=network_volume_id
         )
     
-    # Create new endpoint
+    # Create new endpoint in one REST POST (execution timeout and network
+    # volume included, so the old follow-up PATCH round-trip is gone)
     logger.info(f"Creating new endpoint: {name}")
     
+    payload = {
+        "name": name,
+        "templateId": template_id,
+        "workersMin": workers_min,
+        "workersMax": workers_max,
+        "idleTimeout": idle_timeout,
+        "scalerType": scaler_type,
+        "scalerValue": scaler_value
+    }
+    
+    rest_gpu_ids = normalize_ids(gpu_ids, as_list=True)
+    if rest_gpu_ids:
+        payload["gpuTypeIds"] = rest_gpu_ids
+    
+    rest_data_center_ids = normalize_ids(data_center_ids, as_list=True)
+    if rest_data_center_ids:
+        payload["dataCenterIds"] = rest_data_center_ids
+    
+    if execution_timeout_ms is not None:
+        payload["executionTimeoutMs"] = execution_timeout_ms
+    if network_volume_id is not None:
+        payload["networkVolumeId"] = network_volume_id
+    
     try:
-        response = runpod.create_endpoint(
-            name=name,
-            template_id=template_id,
-            gpu_ids=normalized_gpu_ids,
-            locations=normalized_data_center_ids,
-            workers_min=workers_min,
-            workers_max=workers_max,
-            idle_timeout=idle_timeout,
-            scaler_type=scaler_type,
-            scaler_value=scaler_value
-        )
+        response = _create_endpoint_rest(payload, api_key)
         
         logger.info("Endpoint created successfully!")
-        
-        # Update with execution_timeout_ms if set (not supported in create_endpoint)
-        if execution_timeout_ms and response and "id" in response:
-            new_endpoint_id = response["id"]
-            logger.info(
-                f"Updating endpoint {new_endpoint_id} with "
-                f"execution_timeout_ms={execution_timeout_ms}"
-            )
-            response = update_endpoint(
-                endpoint_id=new_endpoint_id,
-                template_id=template_id,
-                api_key=api_key,
-                name=name,
-                gpu_ids=normalized_gpu_ids,
-                data_center_ids=data_center_ids,
-                workers_min=workers_min,
-                workers_max=workers_max,
-                idle_timeout=idle_timeout,
-                execution_timeout_ms=execution_timeout_ms,
-                scaler_type=scaler_type,
-                scaler_value=scaler_value,
-                network_volume_id=network_volume_id
-            )
+        invalidate_cache()
+        if response and "id" in response:
+            _cache.put(f"name-map://endpoints/{name}", api_key, response["id"])
         
         return response
     
@@ -163,6 +199,10 @@ def create_or_update_endpoint(
 
 def main():
     """Main entry point for the script."""
+    import argparse
+    import sys
+    
+    _log.configure()
     parser = argparse.ArgumentParser(
         description="Create or update a RunPod serverless endpoint",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -281,8 +321,7 @@ Environment Variables:
         if result and isinstance(result, dict):
             if "id" in result:
                 logger.info(f"Endpoint ID: {result['id']}")
-                with open(os.environ.get("GITHUB_OUTPUT", "/dev/stdout"), "a") as gh_out:
-                    gh_out.write(f"endpoint_id={result['id']}\n")
+                _gh_output.emit_output("endpoint_id", result['id'])
             else:
                 logger.error(f"Template ID not found in response: {result}")
                 raise ValueError("Template ID missing in response - cannot set output.")
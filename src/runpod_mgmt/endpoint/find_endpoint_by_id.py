@@ -0,0 +1,97 @@
+"""
+Find a RunPod endpoint by ID using the REST API.
+
+Fetching a single endpoint is O(1) server-side and returns one object,
+versus the SDK's get_endpoints() which pulls the whole account listing.
+"""
+
+import os
+import logging
+from typing import Optional, Dict, Any
+import requests
+from .. import _log
+from .._http import BASE_URL, SESSION
+
+logger = logging.getLogger(__name__)
+
+
+def find_endpoint_by_id(
+    endpoint_id: str,
+    api_key: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Find a RunPod endpoint by its ID.
+
+    Args:
+        endpoint_id: The endpoint ID to fetch
+        api_key: RunPod API key (uses RUNPOD_API_KEY env var if not provided)
+
+    Returns:
+        dict: Endpoint information if found, None if not found
+
+    Raises:
+        ValueError: If API key is not provided
+        requests.exceptions.RequestException: If API request fails
+    """
+    if not api_key:
+        api_key = os.environ.get("RUNPOD_API_KEY")
+        if not api_key:
+            raise ValueError("RUNPOD_API_KEY environment variable is required")
+
+    url = f"{BASE_URL}/endpoints/{endpoint_id}"
+    headers = {"Authorization": f"Bearer {api_key}"}
+
+    try:
+        response = SESSION.get(url, headers=headers, timeout=30)
+
+        # 404 means the endpoint doesn't exist (or the mapping was stale)
+        if response.status_code == 404:
+            logger.info(f"Endpoint not found: {endpoint_id}")
+            return None
+
+        response.raise_for_status()
+
+        endpoint = response.json()
+        logger.info(f"Endpoint found: {endpoint.get('name')} (ID: {endpoint_id})")
+        return endpoint
+
+    except requests.exceptions.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            return None
+        logger.error(f"HTTP error occurred: {e}")
+        raise
+
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Failed to fetch endpoint: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    import sys
+    import argparse
+    import json
+
+    _log.configure()
+
+    parser = argparse.ArgumentParser(description="Find a RunPod endpoint by ID")
+    parser.add_argument("endpoint_id", help="Endpoint ID to fetch")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    try:
+        endpoint = find_endpoint_by_id(args.endpoint_id)
+
+        if endpoint:
+            if args.json:
+                print(json.dumps(endpoint, indent=2))
+            else:
+                print(f"Found: {endpoint.get('name')} (ID: {endpoint.get('id')})")
+            sys.exit(0)
+        else:
+            print(f"Endpoint '{args.endpoint_id}' not found")
+            sys.exit(1)
+
+    except Exception as e:
+        logger.error(f"Error: {e}")
+        sys.exit(1)
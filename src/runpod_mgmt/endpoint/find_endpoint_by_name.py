@@ -6,15 +6,55 @@ The RunPod SDK provides get_endpoints(), which we use to search by name.
 
 import os
 import logging
-from typing import Optional, Dict, Any
-import runpod
+import time
+from .. import _cache, _log
+from typing import Optional, Dict, Any, List
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Short-lived cache of the account's endpoint listing, keyed by api_key.
+# Orchestration flows look up several names in a row; within the TTL they
+# all reuse one runpod.get_endpoints() round-trip.
+_CACHE_TTL = float(os.environ.get("RUNPOD_ENDPOINT_CACHE_TTL", "30"))
+_endpoint_cache: Dict[str, Dict[str, Any]] = {}
+
+
+def invalidate_cache() -> None:
+    """Drop the cached endpoint listing (call after create/update)."""
+    _endpoint_cache.clear()
+    _cache.clear()
+
+
+def _get_listing(api_key: str) -> Dict[str, Any]:
+    """Fetch the endpoint listing plus its name index, cached within the TTL."""
+    entry = _endpoint_cache.get(api_key)
+    if entry and time.monotonic() - entry["ts"] < _CACHE_TTL:
+        return entry
+    
+    # The SDK call has no URL of its own; use a stable pseudo-URL key
+    endpoints = _cache.get("runpod-sdk://get_endpoints", api_key)
+    if endpoints is None:
+        # Lazy-import the RunPod SDK so importing this module stays cheap
+        import runpod
+        runpod.api_key = api_key
+        endpoints = runpod.get_endpoints() or []
+        _cache.put("runpod-sdk://get_endpoints", api_key, endpoints)
+    # Index by name once per fetch; lookups become O(1) dict gets.
+    # Duplicate names keep the first occurrence, like the old linear scan.
+    index = {}
+    for endpoint in endpoints:
+        endpoint_name = endpoint.get("name")
+        if endpoint_name is not None:
+            index.setdefault(endpoint_name, endpoint)
+    entry = {"ts": time.monotonic(), "data": endpoints, "index": index}
+    _endpoint_cache[api_key] = entry
+    return entry
+
+
+def _get_endpoints(api_key: str) -> List[Dict[str, Any]]:
+    """Fetch the endpoint listing, reusing a cached copy within the TTL."""
+    return _get_listing(api_key)["data"]
+
 
 def find_endpoint_by_name(name: str, api_key: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """
@@ -32,23 +72,15 @@ def find_endpoint_by_name(name: str, api_key: Optional[str] = None) -> Optional[
         if not api_key:
             raise ValueError("RUNPOD_API_KEY environment variable is required")
     
-    runpod.api_key = api_key
-    
     try:
         logger.info(f"Searching for endpoint with name: {name}")
         
-        # Get all endpoints
-        endpoints = runpod.get_endpoints()
+        # O(1) lookup in the cached name index
+        endpoint = _get_listing(api_key)["index"].get(name)
         
-        if not endpoints:
-            logger.info("No endpoints found")
-            return None
-        
-        # Search for endpoint by name
-        for endpoint in endpoints:
-            if endpoint.get("name") == name:
-                logger.info(f"Found endpoint: {endpoint.get('id')}")
-                return endpoint
+        if endpoint:
+            logger.info(f"Found endpoint: {endpoint.get('id')}")
+            return endpoint
         
         logger.info(f"No endpoint found with name: {name}")
         return None
@@ -60,6 +92,7 @@ def find_endpoint_by_name(name: str, api_key: Optional[str] = None) -> Optional[
 
 def main():
     """CLI entry point for finding an endpoint by name."""
+    _log.configure()
     import argparse
     
     parser = argparse.ArgumentParser(
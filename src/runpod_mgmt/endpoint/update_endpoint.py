@@ -7,26 +7,16 @@ updating the template, so we use the REST API directly.
 
 import os
 import logging
+import uuid
+from .. import _json, _log
+from .._ids import normalize_ids
 import requests
-from typing import Optional, Dict, Any, List
+from .._http import BASE_URL, SESSION
+from typing import Optional, Dict, Any
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 
-def _normalize_ids_for_rest(ids: Optional[Any]) -> Optional[List[str]]:
-    if ids is None:
-        return None
-    if isinstance(ids, list):
-        return [str(item).strip() for item in ids if str(item).strip()]
-    if isinstance(ids, str):
-        return [item.strip() for item in ids.split(",") if item.strip()]
-    return [str(ids).strip()]
-
-
 def update_endpoint(
     endpoint_id: str,
     template_id: str,
@@ -68,13 +58,14 @@ def update_endpoint(
         if not api_key:
             raise ValueError("RUNPOD_API_KEY environment variable is required")
     
-    # Get base URL from environment or use default
-    base_url = os.environ.get("RUNPOD_REST_API_BASE_URL", "https://rest.runpod.io/v1")
-    url = f"{base_url}/endpoints/{endpoint_id}"
+    url = f"{BASE_URL}/endpoints/{endpoint_id}"
     
     headers = {
         "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
+        "Content-Type": "application/json",
+        # One key per logical call so server-side dedupe covers the
+        # session's automatic retries
+        "Idempotency-Key": str(uuid.uuid4())
     }
     
     # Build update payload - only include provided parameters
@@ -86,12 +77,12 @@ def update_endpoint(
         payload["name"] = name
     
     # Normalize GPU IDs for REST API
-    normalized_gpu_ids = _normalize_ids_for_rest(gpu_ids)
+    normalized_gpu_ids = normalize_ids(gpu_ids, as_list=True)
     if normalized_gpu_ids:
         payload["gpuTypeIds"] = normalized_gpu_ids
 
     # Normalize data center IDs for REST API
-    normalized_data_center_ids = _normalize_ids_for_rest(data_center_ids)
+    normalized_data_center_ids = normalize_ids(data_center_ids, as_list=True)
     if normalized_data_center_ids:
         payload["dataCenterIds"] = normalized_data_center_ids
 
@@ -114,11 +105,16 @@ def update_endpoint(
     logger.info(f"Payload: {payload}")
     
     try:
-        response = requests.patch(url, json=payload, headers=headers)
+        response = SESSION.patch(url, data=_json.dumps(payload), headers=headers, timeout=30)
         response.raise_for_status()
         
-        result = response.json()
+        result = _json.loads(response.content)
         logger.info(f"Endpoint updated successfully")
+        
+        # The cached endpoint listing is stale now (local import keeps this
+        # module free of the find module's dependencies)
+        from .find_endpoint_by_name import invalidate_cache
+        invalidate_cache()
         return result
     
     except requests.exceptions.HTTPError as e:
@@ -132,6 +128,7 @@ def update_endpoint(
 
 def main():
     """CLI entry point for updating an endpoint."""
+    _log.configure()
     import argparse
     import sys
     
@@ -3,20 +3,18 @@ Create or update a RunPod network volume.
 """
 
 import os
-import sys
-import argparse
 import logging
-import traceback
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 import requests
+from .. import _api_key, _gh_output, _log
+from .._http import BASE_URL, SESSION
 from .find_network_volume_by_id import network_volume_exists
 from .update_network_volume_by_id import update_network_volume
-from .find_network_volume_by_name import find_network_volume_by_name
+from .find_network_volume_by_name import find_network_volume_by_name, invalidate_cache
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-RUNPOD_REST_API_BASE_URL = os.environ.get("RUNPOD_REST_API_BASE_URL", "https://rest.runpod.io/v1")
 
 def create_network_volume(
     name: str,
@@ -36,10 +34,8 @@ def create_network_volume(
     Returns:
         dict: Response from RunPod API
     """
-    # Get API key from environment
-    api_key = os.environ.get("RUNPOD_API_KEY")
-    if not api_key:
-        raise ValueError("RUNPOD_API_KEY environment variable is required")
+    # Get API key from environment (cached across calls)
+    api_key = _api_key.api_key()
     
     if size <= 0:
         raise ValueError("size must be a positive integer (GB)")
@@ -53,16 +49,7 @@ def create_network_volume(
     
     
     try:
-        # Check if network_volume_id is provided
-        if network_volume_id:
-            # Check if network volume exists before updating
-            if not network_volume_exists(network_volume_id, api_key):
-                logger.warning(
-                    f"Network volume ID {network_volume_id} does not exist. "
-                    "Creating new network volume instead."
-                )
-                network_volume_id = None
-        else:
+        if not network_volume_id:
             # No network_volume_id provided, search by name
             existing_network_volume = find_network_volume_by_name(name, api_key)
             if existing_network_volume:
@@ -72,24 +59,36 @@ def create_network_volume(
                     "Will update it."
                 )
         
+        response = None
         if network_volume_id: 
-            # Update existing network volume using REST API
+            # Update optimistically instead of pre-checking existence:
+            # the PATCH itself tells us whether the volume is there,
+            # saving one REST round-trip on the common update path.
             logger.info(f"Updating network volume ID: {network_volume_id}")
-            response = update_network_volume(
-                network_volume_id=network_volume_id,
-                name=name,
-                size=size,
-                api_key=api_key,
-            )
-        else:
+            try:
+                response = update_network_volume(
+                    network_volume_id=network_volume_id,
+                    name=name,
+                    size=size,
+                    api_key=api_key,
+                )
+            except requests.exceptions.HTTPError as e:
+                if e.response is None or e.response.status_code != 404:
+                    raise
+                logger.warning(
+                    f"Network volume ID {network_volume_id} does not exist. "
+                    "Creating new network volume instead."
+                )
+        
+        if response is None:
             # Create new network volume
             logger.info("Creating new network volume")
-            url = f"{RUNPOD_REST_API_BASE_URL}/networkvolumes"
+            url = f"{BASE_URL}/networkvolumes"
             headers = {
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json",
             }
-            response = requests.post(
+            response = SESSION.post(
                 url,
                 json=network_volume_config,
                 headers=headers,
@@ -101,6 +100,9 @@ def create_network_volume(
         logger.info("Network volume operation successful!")
         logger.info(f"Response: {response}")
         
+        # The cached volume listing is stale now
+        invalidate_cache()
+        
         return response
     
     except requests.exceptions.HTTPError as e:
@@ -112,14 +114,39 @@ def create_network_volume(
     except requests.exceptions.RequestException as e:
         logger.error(f"Failed to create/update network volume: {e}")
         raise
-    except Exception as e:
-        logger.error(f"Failed to create/update network volume: {e}")
-        logger.error("".join(traceback.format_exc()))
+    except Exception:
+        # logger.exception defers traceback formatting to the handler
+        logger.exception("Failed to create/update network volume")
         raise
 
 
+def create_many_network_volumes(specs: list) -> list:
+    """
+    Create or update several network volumes concurrently.
+    
+    Each spec is a dict of keyword arguments for create_network_volume.
+    The calls are blocking HTTPS round-trips, so running them on a small
+    thread pool overlaps the network waits; the worker cap keeps us well
+    under RunPod's rate limits.
+    
+    Args:
+        specs: List of keyword-argument dicts for create_network_volume
+    
+    Returns:
+        list: Responses from RunPod API, in the same order as specs
+    """
+    if not specs:
+        return []
+    with ThreadPoolExecutor(max_workers=min(8, len(specs))) as ex:
+        return list(ex.map(lambda spec: create_network_volume(**spec), specs))
+
+
 def main():
     """Main entry point for the script."""
+    _log.configure()
+    import argparse
+    import sys
+    
     parser = argparse.ArgumentParser(
         description="Create or update a RunPod network volume for SeedVR2 upscaler",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -170,8 +197,7 @@ Environment Variables:
     
     # Check if network volume exists and handle --create-if-not-exists flag
     if args.create_if_not_exists and args.network_volume_id:
-        api_key = os.environ.get("RUNPOD_API_KEY")
-        if network_volume_exists(args.network_volume_id, api_key):
+        if network_volume_exists(args.network_volume_id, _api_key.api_key()):
             logger.info(
                 f"Network volume {args.network_volume_id} already exists. "
                 "Skipping creation (--create-if-not-exists flag set)."
@@ -192,8 +218,7 @@ Environment Variables:
             if "id" in result:
                 network_volume_id = result['id']
                 logger.info(f"Network Volume ID: {network_volume_id}")
-                with open(os.environ.get("GITHUB_OUTPUT", "/dev/stdout"), "a") as gh_out:
-                    gh_out.write(f"network_volume_id={result['id']}\n")
+                _gh_output.emit_output("network_volume_id", result['id'])
             else:
                 logger.error(f"Network Volume ID not found in response: {result}")
                 raise ValueError("Network Volume ID missing in response - cannot set output.")
@@ -7,16 +7,25 @@ so this script uses the REST API directly.
 
 import os
 import logging
+import time
 from typing import Optional, Dict, Any, List
 import requests
+from .. import _cache, _json, _log
+from .._http import BASE_URL, SESSION
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
-RUNPOD_REST_API_BASE_URL = os.environ.get("RUNPOD_REST_API_BASE_URL")
+
+# Short-lived cache of the account's volume listing, keyed by api_key,
+# so repeated name lookups within the TTL reuse one HTTPS round-trip.
+_CACHE_TTL = float(os.environ.get("RUNPOD_NETWORK_VOLUME_CACHE_TTL", "30"))
+_volume_cache: Dict[str, Dict[str, Any]] = {}
+
+
+def invalidate_cache() -> None:
+    """Drop the cached volume listing (call after create/update)."""
+    _volume_cache.clear()
+    _cache.clear()
 
 
 def list_network_volumes(api_key: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -34,19 +43,48 @@ def list_network_volumes(api_key: Optional[str] = None) -> List[Dict[str, Any]]:
         if not api_key:
             raise ValueError("RUNPOD_API_KEY must be set")
     
-    url = f"{RUNPOD_REST_API_BASE_URL}/networkvolumes"
+    return _get_listing(api_key)["data"]
+
+
+def _get_listing(api_key: Optional[str] = None) -> Dict[str, Any]:
+    """Fetch the volume listing plus its name index, cached within the TTL."""
+    if not api_key:
+        api_key = os.environ.get("RUNPOD_API_KEY")
+        if not api_key:
+            raise ValueError("RUNPOD_API_KEY must be set")
+    
+    entry = _volume_cache.get(api_key)
+    if entry and time.monotonic() - entry["ts"] < _CACHE_TTL:
+        return entry
+    
+    url = f"{BASE_URL}/networkvolumes"
     headers = {"Authorization": f"Bearer {api_key}"}
     
-    try:
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
+    data = _cache.get(url, api_key)
+    if data is None:
+        try:
+            response = SESSION.get(url, headers=headers, timeout=30)
+            response.raise_for_status()
+            
+            data = _json.loads(response.content)
+            data = data if isinstance(data, list) else []
+            _cache.put(url, api_key, data)
         
-        data = response.json()
-        return data if isinstance(data, list) else []
+        except requests.exceptions.RequestException as e:
+            # Failures are not cached; the next call retries the listing
+            logger.error(f"Failed to list network volumes: {e}")
+            return {"ts": 0.0, "data": [], "index": {}}
     
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to list network volumes: {e}")
-        return []
+    # Index by name once per fetch; lookups become O(1) dict gets.
+    # Duplicate names keep the first occurrence, like the old linear scan.
+    index = {}
+    for volume in data:
+        volume_name = volume.get("name")
+        if volume_name is not None:
+            index.setdefault(volume_name, volume)
+    entry = {"ts": time.monotonic(), "data": data, "index": index}
+    _volume_cache[api_key] = entry
+    return entry
 
 
 def find_network_volume_by_name(
@@ -63,12 +101,12 @@ def find_network_volume_by_name(
     Returns:
         dict: Network volume information if found, None if not found
     """
-    network_volumes = list_network_volumes(api_key)
+    # O(1) lookup in the cached name index
+    network_volume = _get_listing(api_key)["index"].get(name)
     
-    for network_volume in network_volumes:
-        if network_volume.get("name") == name:
-            logger.info(f"Found network volume '{name}' with ID: {network_volume.get('id')}")
-            return network_volume
+    if network_volume:
+        logger.info(f"Found network volume '{name}' with ID: {network_volume.get('id')}")
+        return network_volume
     
     logger.info(f"Network volume not found: {name}")
     return None
@@ -79,6 +117,8 @@ if __name__ == "__main__":
     import argparse
     import json
     
+    _log.configure()
+    
     parser = argparse.ArgumentParser(description="Find a RunPod network volume by name")
     parser.add_argument("name", help="Network volume name to search for")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
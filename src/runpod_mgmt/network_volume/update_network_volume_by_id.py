@@ -9,17 +9,16 @@ import os
 import sys
 import argparse
 import logging
+import uuid
+import functools
+from .. import _json, _log
 import json
 from typing import Optional, Dict, Any
 import requests
+from .._http import BASE_URL, SESSION
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
-RUNPOD_REST_API_BASE_URL = os.environ.get("RUNPOD_REST_API_BASE_URL", "https://rest.runpod.io/v1")
 
 def update_network_volume(
     network_volume_id: str,
@@ -67,10 +66,14 @@ def update_network_volume(
     if size is not None and size <= 0:
         raise ValueError("--size must be a positive integer (GB)")
 
-    url = f"{RUNPOD_REST_API_BASE_URL}/networkvolumes/{network_volume_id}"
+    url = f"{BASE_URL}/networkvolumes/{network_volume_id}"
     headers = {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json",
+        # One key per logical call: the session's automatic retries resend
+        # it, letting the server dedupe a PATCH that was applied but whose
+        # response was lost
+        "Idempotency-Key": str(uuid.uuid4()),
     }
 
     # Build payload (only provided fields)
@@ -81,12 +84,14 @@ def update_network_volume(
         payload["size"] = size
 
     logger.info(f"Updating network volume {network_volume_id}")
-    logger.debug(f"Payload: {json.dumps(payload, indent=2)}")
+    # Only pay for the dump when the DEBUG sink is actually on
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Payload: %s", _json.dumps(payload).decode("utf-8"))
 
     try:
-        response = requests.patch(url, json=payload, headers=headers, timeout=30)
+        response = SESSION.patch(url, json=payload, headers=headers, timeout=30)
         response.raise_for_status()
-        result = response.json()
+        result = _json.loads(response.content)
         logger.info("Network volume updated successfully")
         return result
     except requests.exceptions.HTTPError as e:
@@ -101,8 +106,9 @@ def update_network_volume(
         raise
 
 
-def main():
-    """CLI entry point for updating a network volume."""
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser once per process; repeat calls reuse it."""
     parser = argparse.ArgumentParser(
         description="Update a RunPod network volume using the REST API",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -141,8 +147,13 @@ Environment Variables:
         action="store_true",
         help="Output response as JSON"
     )
+    return parser
+
 
-    args = parser.parse_args()
+def main():
+    """CLI entry point for updating a network volume."""
+    _log.configure()
+    args = _build_parser().parse_args()
 
     try:
         result = update_network_volume(
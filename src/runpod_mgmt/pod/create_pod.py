@@ -9,11 +9,12 @@ import os
 import sys
 import argparse
 import logging
-import traceback
+import functools
+from .. import _log
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any
 import runpod
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
 
@@ -78,22 +79,44 @@ def create_pod(
     return response
 
 
+def create_many_pods(specs: list) -> list:
+    """
+    Create several pods concurrently.
+
+    Each spec is a dict of keyword arguments for create_pod. The SDK's
+    create_pod is a blocking HTTPS round-trip, so a small thread pool
+    overlaps the network waits; the worker cap keeps the burst well
+    under RunPod's rate limits.
+
+    Args:
+        specs: List of keyword-argument dicts for create_pod
+
+    Returns:
+        list: Responses from RunPod API, in the same order as specs
+    """
+    if not specs:
+        return []
+    with ThreadPoolExecutor(max_workers=min(8, len(specs))) as ex:
+        return list(ex.map(lambda spec: create_pod(**spec), specs))
+
+
 def _parse_env_vars(env_list) -> Optional[Dict[str, str]]:
     if not env_list:
         return None
 
-    env_vars: Dict[str, str] = {}
-    for env_pair in env_list:
-        try:
-            key, value = env_pair.split("=", 1)
-            env_vars[key] = value
-        except ValueError:
-            raise ValueError(f"Invalid environment variable format: {env_pair}") from None
+    # partition never raises, so malformed entries are caught in one
+    # validation pass instead of via try/except per pair
+    pairs = [pair.partition("=") for pair in env_list]
+    for original, (_, sep, _) in zip(env_list, pairs):
+        if sep != "=":
+            raise ValueError(f"Invalid environment variable format: {original}")
 
-    return env_vars
+    return {key: value for key, _, value in pairs}
 
 
-def main() -> None:
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser once per process; repeat calls reuse it."""
     parser = argparse.ArgumentParser(
         description="Create a RunPod pod using the SDK",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -162,8 +185,12 @@ Environment Variables:
     )
     parser.add_argument("--json", action="store_true", help="Output response as JSON")
     parser.set_defaults(start_ssh=True, support_public_ip=True)
+    return parser
 
-    args = parser.parse_args()
+
+def main() -> None:
+    _log.configure()
+    args = _build_parser().parse_args()
 
     try:
         env_vars = _parse_env_vars(args.env)
@@ -199,8 +226,8 @@ Environment Variables:
                 gh_out.write(f"pod_id={result['id']}\n")
 
     except Exception as exc:
-        logger.error(f"✗ Failed: {exc}")
-        logger.error("".join(traceback.format_exc()))
+        # logger.exception defers traceback formatting to the handler
+        logger.exception(f"✗ Failed: {exc}")
         sys.exit(1)
 
 
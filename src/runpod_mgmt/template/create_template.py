@@ -6,17 +6,14 @@ configuration for the video upscaling serverless function.
 """
 
 import os
-import sys
-import argparse
 import logging
-import traceback
 from typing import Optional
-import runpod
+import requests
+from .. import _gh_output, _log
 from .find_template_by_id import template_exists
 from .update_template_by_id import update_template
-from .find_template_by_name import find_template_by_name
+from .find_template_by_name import find_template_by_name, invalidate_cache
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
@@ -69,20 +66,15 @@ def create_template(
     if env_vars:
         template_config["env"] = env_vars
     
+    # Lazy-import the RunPod SDK so callers that only hit the update path
+    # (or only import this module) don't pay its import cost
+    import runpod
+    
     try:
         # Initialize RunPod with API key
         runpod.api_key = api_key
         
-        # Check if template_id is provided
-        if template_id:
-            # Check if template exists before updating
-            if not template_exists(template_id, api_key):
-                logger.warning(
-                    f"Template ID {template_id} does not exist. "
-                    "Creating new template instead."
-                )
-                template_id = None
-        else:
+        if not template_id:
             # No template_id provided, search by name
             existing_template = find_template_by_name(name, api_key)
             if existing_template:
@@ -93,17 +85,28 @@ def create_template(
                 )
         
         if template_id: 
-            # Update existing template using REST API
+            # Update optimistically instead of pre-checking existence:
+            # the PATCH itself tells us whether the template is there,
+            # saving one REST round-trip on the common update path.
             logger.info(f"Updating template ID: {template_id}")
-            response = update_template(
-                template_id=template_id,
-                name=name,
-                image_name=image,
-                container_disk_in_gb=template_config["container_disk_in_gb"],
-                volume_in_gb=template_config["volume_in_gb"],
-                volume_mount_path=template_config["volume_mount_path"],
-                env=template_config.get('env', None),
-                api_key=api_key)
+            try:
+                response = update_template(
+                    template_id=template_id,
+                    name=name,
+                    image_name=image,
+                    container_disk_in_gb=template_config["container_disk_in_gb"],
+                    volume_in_gb=template_config["volume_in_gb"],
+                    volume_mount_path=template_config["volume_mount_path"],
+                    env=template_config.get('env', None),
+                    api_key=api_key)
+            except requests.exceptions.HTTPError as e:
+                if e.response is None or e.response.status_code != 404:
+                    raise
+                logger.warning(
+                    f"Template ID {template_id} does not exist. "
+                    "Creating new template instead."
+                )
+                response = runpod.create_template(**template_config)
         else:
             # Create new template
             logger.info("Creating new template")
@@ -112,16 +115,22 @@ def create_template(
         logger.info("Template operation successful!")
         logger.info(f"Response: {response}")
         
+        # The cached template listing is stale now
+        invalidate_cache()
+        
         return response
     
-    except Exception as e:
-        logger.error(f"Failed to create/update template: {e}")
-        logger.error("".join(traceback.format_exc()))
+    except Exception:
+        logger.exception("Failed to create/update template")
         raise
 
 
 def main():
     """Main entry point for the script."""
+    _log.configure()
+    import argparse
+    import sys
+    
     parser = argparse.ArgumentParser(
         description="Create or update a RunPod template for SeedVR2 upscaler",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -244,8 +253,7 @@ Environment Variables:
             if "id" in result:
                 template_id = result['id']
                 logger.info(f"Template ID: {template_id}")
-                with open(os.environ.get("GITHUB_OUTPUT", "/dev/stdout"), "a") as gh_out:
-                    gh_out.write(f"template_id={result['id']}\n")
+                _gh_output.emit_output("template_id", result['id'])
             else:
                 logger.error(f"Template ID not found in response: {result}")
                 raise ValueError("Template ID missing in response - cannot set output.")
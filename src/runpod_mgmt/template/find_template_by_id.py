@@ -9,17 +9,15 @@ import os
 import sys
 import argparse
 import logging
+import functools
+from .. import _cache, _json, _log
 import json
 from typing import Optional, Dict, Any
 import requests
+from .._http import BASE_URL, SESSION
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
-RUNPOD_REST_API_BASE_URL = os.environ.get("RUNPOD_REST_API_BASE_URL")
 
 def find_template_by_id(
     template_id: str,
@@ -48,23 +46,33 @@ def find_template_by_id(
                 "environment variable must be set"
             )
     
-    url = f"{RUNPOD_REST_API_BASE_URL}/templates/{template_id}"
+    url = f"{BASE_URL}/templates/{template_id}"
+    
+    cached = _cache.get(url, api_key or os.environ.get("RUNPOD_API_KEY", ""))
+    if cached is not None:
+        logger.debug("cache_hit template %s", template_id)
+        return cached
+    logger.debug("cache_miss template %s", template_id)
     headers = {"Authorization": f"Bearer {api_key}"}
     
     logger.info(f"Checking if template exists: {template_id}")
     
     try:
-        response = requests.get(url, headers=headers, timeout=30)
-        
+        # stream=True defers the body read until .content is touched, so
+        # the 404 path below costs only headers
+        response = SESSION.get(url, headers=headers, timeout=30, stream=True)
+
         # 404 means template doesn't exist
         if response.status_code == 404:
             logger.info(f"Template not found: {template_id}")
+            response.close()
             return None
-        
+
         # Raise for other error status codes
         response.raise_for_status()
-        
-        template = response.json()
+
+        template = _json.loads(response.content)
+        _cache.put(url, api_key or os.environ.get("RUNPOD_API_KEY", ""), template)
         logger.info(f"Template found: {template.get('name')} (ID: {template_id})")
         return template
     
@@ -79,6 +87,12 @@ def find_template_by_id(
         raise
 
 
+# Whether the REST API accepts HEAD on this resource; existence checks
+# drop the response body entirely when it does. Flips to False on the
+# first 405 and stays off for the rest of the process.
+_HEAD_SUPPORTED = True
+
+
 def template_exists(
     template_id: str,
     api_key: Optional[str] = None
@@ -93,6 +107,23 @@ def template_exists(
     Returns:
         bool: True if template exists, False otherwise
     """
+    global _HEAD_SUPPORTED
+    if _HEAD_SUPPORTED:
+        if not api_key:
+            api_key = os.environ.get("RUNPOD_API_KEY")
+        try:
+            response = SESSION.head(
+                f"{BASE_URL}/templates/{template_id}",
+                headers={"Authorization": f"Bearer {api_key}"},
+                timeout=30,
+            )
+            if response.status_code != 405:
+                return response.status_code == 200
+            # HEAD not supported here; remember and use GET from now on
+            _HEAD_SUPPORTED = False
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error checking template existence: {e}")
+            return False
     try:
         template = find_template_by_id(template_id, api_key)
         return template is not None
@@ -101,8 +132,9 @@ def template_exists(
         return False
 
 
-def main():
-    """Main entry point for the script."""
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser once per process; repeat calls reuse it."""
     parser = argparse.ArgumentParser(
         description="Find a RunPod template by ID",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -144,8 +176,13 @@ Environment Variables:
         action="store_true",
         help="Suppress informational output"
     )
-    
-    args = parser.parse_args()
+    return parser
+
+
+def main():
+    """Main entry point for the script."""
+    _log.configure()
+    args = _build_parser().parse_args()
     
     if args.quiet:
         logger.setLevel(logging.ERROR)
@@ -7,16 +7,26 @@ so this script uses the REST API directly.
 
 import os
 import logging
+import time
 from typing import Optional, Dict, Any, List
+from urllib.parse import quote
 import requests
+from .. import _cache, _json, _log
+from .._http import BASE_URL, SESSION
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
-RUNPOD_REST_API_BASE_URL = os.environ.get("RUNPOD_REST_API_BASE_URL")
+# Short-lived cache of the account's template listing, keyed by api_key,
+# so validate-then-create flows reuse one round-trip within the TTL.
+_CACHE_TTL = float(os.environ.get("RUNPOD_TEMPLATE_CACHE_TTL", "60"))
+_template_cache: Dict[str, Dict[str, Any]] = {}
+
+
+def invalidate_cache() -> None:
+    """Drop the cached template listing (call after create/update)."""
+    _template_cache.clear()
+    _cache.clear()
+
 
 
 def list_templates(api_key: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -34,24 +44,75 @@ def list_templates(api_key: Optional[str] = None) -> List[Dict[str, Any]]:
         if not api_key:
             raise ValueError("RUNPOD_API_KEY must be set")
     
-    url = f"{RUNPOD_REST_API_BASE_URL}/templates"
+    entry = _template_cache.get(api_key)
+    if entry and time.monotonic() - entry["ts"] < _CACHE_TTL:
+        logger.debug("cache_hit template listing")
+        return entry["data"]
+    logger.debug("cache_miss template listing")
+    
+    url = f"{BASE_URL}/templates"
     headers = {"Authorization": f"Bearer {api_key}"}
     
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response = SESSION.get(url, headers=headers, timeout=30)
         response.raise_for_status()
         
         # API might return {"templates": [...]} or just [...]
-        data = response.json()
+        data = _json.loads(response.content)
         if isinstance(data, dict) and "templates" in data:
-            return data["templates"]
-        return data if isinstance(data, list) else []
+            data = data["templates"]
+        else:
+            data = data if isinstance(data, list) else []
+        _template_cache[api_key] = {"ts": time.monotonic(), "data": data}
+        return data
     
     except requests.exceptions.RequestException as e:
+        # Failures are not cached; the next call retries the listing
         logger.error(f"Failed to list templates: {e}")
         return []
 
 
+# Whether the API honours a ?name= filter on the listing; flips to False
+# the first time the server visibly ignores it and stays off for the
+# rest of the process.
+_SERVER_FILTER_SUPPORTED = True
+
+
+def _find_via_server_filter(
+    name: str,
+    api_key: str
+) -> Optional[Dict[str, Any]]:
+    """Try a server-side name filter; None means 'fall back to listing'."""
+    global _SERVER_FILTER_SUPPORTED
+    if not _SERVER_FILTER_SUPPORTED:
+        return None
+    
+    url = f"{BASE_URL}/templates?name={quote(name)}"
+    headers = {"Authorization": f"Bearer {api_key}"}
+    
+    try:
+        response = SESSION.get(url, headers=headers, timeout=30)
+        response.raise_for_status()
+        
+        data = _json.loads(response.content)
+        if isinstance(data, dict) and "templates" in data:
+            data = data["templates"]
+        if isinstance(data, list):
+            if len(data) == 1 and data[0].get("name") == name:
+                return data[0]
+            if len(data) > 1:
+                # The server returned the unfiltered listing: the filter
+                # parameter is not supported, stop paying for the probe
+                _SERVER_FILTER_SUPPORTED = False
+        # An empty result is ambiguous (missing name or ignored filter);
+        # let the full listing give the definitive answer
+        return None
+    
+    except requests.exceptions.RequestException as e:
+        logger.debug("Server-side name filter probe failed: %s", e)
+        return None
+
+
 def find_template_by_name(
     name: str,
     api_key: Optional[str] = None
@@ -59,6 +120,10 @@ def find_template_by_name(
     """
     Find a RunPod template by its name.
     
+    Prefers a server-side ?name= filter (a few KB on the wire) and falls
+    back to scanning the full cached listing when the deployment does
+    not support it.
+    
     Args:
         name: The template name to search for
         api_key: RunPod API key (uses RUNPOD_API_KEY env var if not provided)
@@ -66,6 +131,16 @@ def find_template_by_name(
     Returns:
         dict: Template information if found, None if not found
     """
+    if not api_key:
+        api_key = os.environ.get("RUNPOD_API_KEY")
+        if not api_key:
+            raise ValueError("RUNPOD_API_KEY must be set")
+    
+    template = _find_via_server_filter(name, api_key)
+    if template is not None:
+        logger.info(f"Found template '{name}' with ID: {template.get('id')}")
+        return template
+    
     templates = list_templates(api_key)
     
     for template in templates:
@@ -77,11 +152,69 @@ def find_template_by_name(
     return None
 
 
+def find_templates_by_names(
+    names: List[str],
+    api_key: Optional[str] = None
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Resolve several template names against a single listing fetch.
+    
+    Matrix-style CI jobs that look up templates back-to-back should call
+    this once instead of paying one listing round-trip per name.
+    
+    Args:
+        names: Template names to resolve
+        api_key: RunPod API key (uses RUNPOD_API_KEY env var if not provided)
+    
+    Returns:
+        dict: {name: template or None}, one entry per requested name
+    """
+    templates = list_templates(api_key)
+    
+    index = {}
+    for template in templates:
+        template_name = template.get("name")
+        if template_name is not None:
+            index.setdefault(template_name, template)
+    
+    return {name: index.get(name) for name in names}
+
+
+def find_templates_by_ids(
+    ids: List[str],
+    api_key: Optional[str] = None
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Resolve several template IDs against a single listing fetch.
+
+    Preflight flows that validate two or more templates should call this
+    once (one round-trip) instead of one GET /templates/{id} per ID.
+
+    Args:
+        ids: Template IDs to resolve
+        api_key: RunPod API key (uses RUNPOD_API_KEY env var if not provided)
+
+    Returns:
+        dict: {id: template or None}, one entry per requested ID
+    """
+    templates = list_templates(api_key)
+
+    index = {}
+    for template in templates:
+        template_id = template.get("id")
+        if template_id is not None:
+            index.setdefault(template_id, template)
+
+    return {template_id: index.get(template_id) for template_id in ids}
+
+
 if __name__ == "__main__":
     import sys
     import argparse
     import json
     
+    _log.configure()
+    
     parser = argparse.ArgumentParser(description="Find a RunPod template by name")
     parser.add_argument("name", help="Template name to search for")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
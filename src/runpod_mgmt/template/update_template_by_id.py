@@ -6,20 +6,16 @@ so this script uses the REST API directly.
 """
 
 import os
-import sys
-import argparse
 import logging
+import uuid
 import json
 from typing import Optional, Dict, Any
 import requests
+from .. import _api_key, _json, _log
+from .._http import BASE_URL, SESSION
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
-RUNPOD_REST_API_BASE_URL = os.environ.get("RUNPOD_REST_API_BASE_URL")
 
 def update_template(
     template_id: str,
@@ -32,8 +28,7 @@ def update_template(
     env: Optional[Dict[str, str]] = None,
     ports: Optional[str] = None,
     is_public: Optional[bool] = None,
-    api_key: Optional[str] = None,
-    **kwargs
+    api_key: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Update a RunPod template using the REST API.
@@ -50,7 +45,6 @@ def update_template(
         ports: Port mappings (e.g., "8888/http,22/tcp")
         is_public: Whether the template is public
         api_key: RunPod API key (uses RUNPOD_API_KEY env var if not provided)
-        **kwargs: Additional parameters to pass to the API
     
     Returns:
         dict: Response from RunPod API
@@ -59,55 +53,53 @@ def update_template(
         ValueError: If API key is not provided
         requests.exceptions.RequestException: If API request fails
     """
-    # Get API key from environment if not provided
+    # Get API key from environment if not provided (cached across calls)
     if not api_key:
-        api_key = os.environ.get("RUNPOD_API_KEY")
-        if not api_key:
-            raise ValueError(
-                "API key must be provided or RUNPOD_API_KEY "
-                "environment variable must be set"
-            )
+        api_key = _api_key.api_key()
     
-    url = f"{RUNPOD_REST_API_BASE_URL}/templates/{template_id}"
+    url = f"{BASE_URL}/templates/{template_id}"
     headers = {
         "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
+        "Content-Type": "application/json",
+        # One key per logical call so server-side dedupe covers the
+        # session's automatic retries
+        "Idempotency-Key": str(uuid.uuid4())
     }
     
-    # Build payload with only provided parameters
-    payload = {}
-    
-    if name is not None:
-        payload["name"] = name
-    if image_name is not None:
-        payload["imageName"] = image_name
-    if container_disk_in_gb is not None:
-        payload["containerDiskInGb"] = container_disk_in_gb
-    if volume_in_gb is not None:
-        payload["volumeInGb"] = volume_in_gb
-    if volume_mount_path is not None:
-        payload["volumeMountPath"] = volume_mount_path
-    if docker_start_cmd is not None:
-        payload["dockerStartCmd"] = docker_start_cmd if isinstance(docker_start_cmd, list) else [docker_start_cmd]
-    if env is not None:
-        payload["env"] = env
-    if ports is not None:
-        payload["ports"] = ports
-    if is_public is not None:
-        payload["isPublic"] = is_public
-    
-    # Add any additional kwargs
-    payload.update(kwargs)
+    # Build payload with only provided parameters, in a single pass
+    payload = {
+        key: value
+        for key, value in (
+            ("name", name),
+            ("imageName", image_name),
+            ("containerDiskInGb", container_disk_in_gb),
+            ("volumeInGb", volume_in_gb),
+            ("volumeMountPath", volume_mount_path),
+            ("dockerStartCmd", [docker_start_cmd] if isinstance(docker_start_cmd, str) else docker_start_cmd),
+            ("env", env),
+            ("ports", ports),
+            ("isPublic", is_public),
+        )
+        if value is not None
+    }
     
+    body = _json.dumps(payload)
     logger.info(f"Updating template {template_id}")
-    logger.debug(f"Payload: {json.dumps(payload, indent=2)}")
+    # Only pay for the decode when the DEBUG sink is actually on
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Payload: %s", body.decode("utf-8"))
     
     try:
-        response = requests.patch(url, json=payload, headers=headers, timeout=30)
+        response = SESSION.patch(url, data=body, headers=headers, timeout=30)
         response.raise_for_status()
         
-        result = response.json()
+        result = _json.loads(response.content)
         logger.info(f"Template updated successfully: {template_id}")
+        
+        # The cached template listing is stale now (local import keeps this
+        # module free of the find module's dependencies)
+        from .find_template_by_name import invalidate_cache
+        invalidate_cache()
         return result
     
     except requests.exceptions.HTTPError as e:
@@ -122,6 +114,10 @@ def update_template(
 
 def main():
     """Main entry point for the script."""
+    _log.configure()
+    import argparse
+    import sys
+    
     parser = argparse.ArgumentParser(
         description="Update a RunPod template using the REST API",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -226,10 +222,14 @@ Environment Variables:
                 sys.exit(1)
     
     try:
-        # Build kwargs from args
+        # Build kwargs from the known update_template parameters only
         kwargs = {
-            k: v for k, v in vars(args).items()
-            if v is not None and k not in ['template_id', 'env', 'json']
+            k: getattr(args, k)
+            for k in (
+                "name", "image_name", "container_disk_in_gb", "volume_in_gb",
+                "volume_mount_path", "docker_start_cmd", "ports", "is_public",
+            )
+            if getattr(args, k) is not None
         }
         
         if env_vars:
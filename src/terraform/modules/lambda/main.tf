@@ -27,6 +27,9 @@ module "presign_model_urls_lambda" {
   description   = "Lambda function to generate presigned URLs for S3 objects"
   handler       = "index.lambda_handler"
   runtime       = "python3.12"
+  # Graviton2: same Python workload, ~20% cheaper and typically faster for
+  # the boto3/TLS/JSON profile these functions run.
+  architectures = ["arm64"]
 
   source_path = "${path.module}/../../../lambdas/presign_s3_urls"
 
@@ -95,6 +98,9 @@ module "runpod_webhook_handler_lambda" {
   description   = "Lambda function to handle RunPod webhook callbacks"
   handler       = "index.lambda_handler"
   runtime       = "python3.12"
+  # Graviton2: same Python workload, ~20% cheaper and typically faster for
+  # the boto3/TLS/JSON profile these functions run.
+  architectures = ["arm64"]
 
   source_path = "${path.module}/../../../lambdas/runpod_webhook_handler"
 
@@ -171,6 +177,9 @@ module "submit_runpod_job_lambda" {
   description   = "Lambda function to submit RunPod jobs"
   handler       = "index.lambda_handler"
   runtime       = "python3.12"
+  # Graviton2: same Python workload, ~20% cheaper and typically faster for
+  # the boto3/TLS/JSON profile these functions run.
+  architectures = ["arm64"]
 
   source_path = "${path.module}/../../../lambdas/submit_runpod_job"
 